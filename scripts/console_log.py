@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Console Log
+Queued console output shared by the deploy and service management scripts
+"""
+
+import sys
+import atexit
+import queue
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+_LOG_FMT = "[%H:%M:%S]"
+
+class _ConsoleFormatter(logging.Formatter):
+    """Prefix log_message() lines with time and level; echo() lines pass through"""
+    
+    def format(self, record):
+        if record.level is None:
+            return record.getMessage()
+        return f"{self.formatTime(record, _LOG_FMT)} {record.level}: {record.getMessage()}"
+
+# Console output goes through one queue drained by a background thread, so
+# worker threads never block on a slow terminal and lines stay in order.
+# The thread is only started by the first line written, not on import.
+_console = logging.getLogger("chaos_world.console")
+_console.setLevel(logging.INFO)
+_console.propagate = False
+_console_listener = None
+_console_lock = threading.Lock()
+
+def _console_logger() -> logging.Logger:
+    """Return the console logger, starting its listener thread on first use"""
+    global _console_listener
+    if _console_listener is None:
+        with _console_lock:
+            if _console_listener is None:
+                handler = logging.StreamHandler(sys.stdout)
+                handler.setFormatter(_ConsoleFormatter())
+                listener = QueueListener(queue.SimpleQueue(), handler)
+                _console.addHandler(QueueHandler(listener.queue))
+                listener.start()
+                # Stopping drains the queue, so no line is lost at exit
+                atexit.register(listener.stop)
+                _console_listener = listener
+    return _console
+
+def log_message(message: str, level: str = "INFO"):
+    """Queue a timestamped log line"""
+    _console_logger().info(message, extra={"level": level})
+
+def echo(text: str = ""):
+    """Queue a plain console line, ordered with the log lines"""
+    _console_logger().info(text, extra={"level": None})
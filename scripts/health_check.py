@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Service Health Check
+The /health response check shared by the service management scripts
+"""
+
+def is_healthy_response(response, strict: bool = False) -> bool:
+    """Check that a /health response is 2xx (and reports ok in strict mode)"""
+    if not 200 <= response.status_code < 300:
+        return False
+    if strict:
+        try:
+            return response.json().get("status") == "ok"
+        except (ValueError, AttributeError):
+            return False
+    return True
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Shared Monitoring Configuration
+Grafana dashboards, provisioning and file helpers used by the monitoring setup scripts
+"""
+
+import json
+from pathlib import Path
+
+def write_if_changed(path, data):
+    """Write bytes to path unless the file already has identical content"""
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+# Paths under Grafana's provisioning directory. Every setup script writes the
+# same files with the same content, so rerunning one overwrites the other's
+# instead of provisioning a second default datasource
+DATASOURCE_PROVISIONING_FILE = Path("datasources") / "prometheus.yml"
+DASHBOARD_PROVISIONING_FILE = Path("dashboards") / "chaos-world.yml"
+
+def datasource_provisioning(prometheus_url):
+    """Render the Prometheus datasource provisioning file"""
+    config = {
+        "apiVersion": 1,
+        "datasources": [
+            {
+                "name": "Prometheus",
+                "type": "prometheus",
+                "url": prometheus_url,
+                "access": "proxy",
+                "isDefault": True,
+                "editable": True
+            }
+        ]
+    }
+    return json.dumps(config, separators=(",", ":")).encode()
+
+def dashboard_provisioning(dashboards_dir):
+    """Render the dashboard provider provisioning file"""
+    config = {
+        "apiVersion": 1,
+        "providers": [
+            {
+                "name": "chaos-world-dashboards",
+                "type": "file",
+                "options": {
+                    "path": str(dashboards_dir)
+                }
+            }
+        ]
+    }
+    return json.dumps(config, separators=(",", ":")).encode()
+
+# Service status panel colours and labels up/down values
+STATUS_FIELD_CONFIG = {
+    "defaults": {
+        "color": {
+            "mode": "thresholds"
+        },
+        "thresholds": {
+            "steps": [
+                {"color": "red", "value": 0},
+                {"color": "green", "value": 1}
+            ]
+        },
+        "mappings": [
+            {"type": "value", "value": "0", "text": "DOWN"},
+            {"type": "value", "value": "1", "text": "UP"}
+        ]
+    }
+}
+
+# One row per panel: (title, type, ((expr, legend), ...), (h, w, x, y), extra fields)
+PANELS = (
+    ("Service Status", "stat",
+     (("up{job=~\"chaos-world-.*\"}", "{{job}}"),),
+     (8, 12, 0, 0), {"fieldConfig": STATUS_FIELD_CONFIG}),
+    ("Request Rate", "graph",
+     (("rate(cms_request_duration_seconds_count[5m])", "CMS Requests/sec"),
+      ("rate(user_management_request_duration_seconds_count[5m])", "User Management Requests/sec")),
+     (8, 12, 12, 0), {}),
+    ("Response Time", "graph",
+     (("histogram_quantile(0.95, rate(cms_request_duration_seconds_bucket[5m]))", "95th percentile"),
+      ("histogram_quantile(0.50, rate(cms_request_duration_seconds_bucket[5m]))", "50th percentile")),
+     (8, 24, 0, 8), {}),
+    ("User Management Metrics", "graph",
+     (("rate(user_management_http_requests_total[5m])", "User Management HTTP Requests/sec"),
+      ("rate(user_management_auth_attempts_total[5m])", "Authentication Attempts/sec"),
+      ("rate(user_management_registrations_total[5m])", "User Registrations/sec")),
+     (8, 24, 0, 16), {}),
+)
+
+def _render_panel(panel_id, title, panel_type, targets, grid_pos, extra):
+    """Expand one PANELS row into Grafana's panel JSON"""
+    h, w, x, y = grid_pos
+    return {
+        "id": panel_id,
+        "title": title,
+        "type": panel_type,
+        "targets": [{"expr": expr, "legendFormat": legend} for expr, legend in targets],
+        **extra,
+        "gridPos": {"h": h, "w": w, "x": x, "y": y}
+    }
+
+# Overview dashboard pushed by setup_grafana_manual and provisioned by setup_monitoring
+SIMPLE_DASHBOARD = {
+    "dashboard": {
+        "id": None,
+        "title": "Chaos World - Simple Overview",
+        "tags": ["chaos-world"],
+        "timezone": "browser",
+        "panels": [_render_panel(panel_id, *panel) for panel_id, panel in enumerate(PANELS, 1)],
+        "time": {
+            "from": "now-1h",
+            "to": "now"
+        },
+        "refresh": "5s"
+    }
+}
@@ -4,6 +4,7 @@ Chaos World Service Manager
 A Python-based service management tool for Windows services using NSSM
 """
 
+import asyncio
 import subprocess
 import sys
 import time
@@ -11,8 +12,12 @@ import requests
 import json
 from pathlib import Path
 
+# The /health check is shared with the deploy tooling
+sys.path.insert(0, str(Path(__file__).parent))
+from health_check import is_healthy_response
+
 class ServiceManager:
-    def __init__(self):
+    def __init__(self, strict_health=False):
         self.services = {
             'api-gateway': 'ChaosWorld-API-Gateway',
             'chaos-backend': 'ChaosWorld-Backend'
@@ -21,6 +26,8 @@ class ServiceManager:
             'api-gateway': 'http://localhost:8080',
             'chaos-backend': 'http://localhost:8081'
         }
+        # Also require {"status": "ok"} in the /health body, not just a 2xx
+        self.strict_health = strict_health
     
     def run_command(self, command, check=True):
         """Run a command and return the result"""
@@ -66,11 +73,15 @@ class ServiceManager:
         time.sleep(2)
         return self.start_service(service_name)
     
+    def is_healthy_response(self, response):
+        """Check that a /health response is 2xx (and reports ok in strict mode)"""
+        return is_healthy_response(response, self.strict_health)
+    
     def test_endpoint(self, service_name, endpoint):
         """Test if an endpoint is responding"""
         try:
             response = requests.get(f"{endpoint}/health", timeout=5)
-            if response.status_code == 200:
+            if self.is_healthy_response(response):
                 print(f"✅ {service_name} is responding on {endpoint}")
                 return True
             else:
@@ -85,18 +96,39 @@ class ServiceManager:
         success, stdout, stderr = self.run_command(f'netstat -an | findstr ":{port}"', check=False)
         return success
     
+    def check_endpoint(self, endpoint):
+        """Quietly check whether an endpoint's /health is healthy"""
+        try:
+            return self.is_healthy_response(requests.get(f"{endpoint}/health", timeout=5))
+        except requests.exceptions.RequestException:
+            return False
+    
+    async def _probe(self, service_key, service_name):
+        """Run the service, port and endpoint checks for one service concurrently"""
+        port = 8080 if service_key == 'api-gateway' else 8081
+        return await asyncio.gather(
+            asyncio.to_thread(self.check_service_status, service_name),
+            asyncio.to_thread(self.check_port, port),
+            asyncio.to_thread(self.check_endpoint, self.endpoints[service_key]),
+        )
+    
+    async def _probe_all(self):
+        """Probe every service at once; results keep the order of self.services"""
+        return await asyncio.gather(
+            *(self._probe(key, name) for key, name in self.services.items())
+        )
+    
     def status(self):
         """Show comprehensive status of all services"""
         print("=" * 60)
         print("🔍 CHAOS WORLD SERVICES STATUS")
         print("=" * 60)
         
-        for service_key, service_name in self.services.items():
+        results = asyncio.run(self._probe_all())
+        
+        for service_key, (is_running, port_in_use, endpoint_responding) in zip(self.services, results):
             print(f"\n📋 {service_key.upper()}:")
-            is_running = self.check_service_status(service_name)
             port = 8080 if service_key == 'api-gateway' else 8081
-            port_in_use = self.check_port(port)
-            endpoint_responding = self.test_endpoint(service_key, self.endpoints[service_key])
             
             status_icon = "✅" if is_running else "❌"
             port_icon = "✅" if port_in_use else "❌"
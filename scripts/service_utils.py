@@ -6,17 +6,21 @@ A utility module for managing Chaos World services without requiring admin privi
 
 import os
 import sys
+import asyncio
 import subprocess
 import time
 import shutil
 import psutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional
+from health_check import is_healthy_response
+from console_log import log_message, echo
 
 class ServiceUtils:
     """Utility class for managing services without admin privileges"""
     
-    def __init__(self):
+    def __init__(self, strict_health: bool = False):
         self.project_root = Path(__file__).parent.parent
         self.service_dir = Path("C:/ChaosWorld/services")
         self.target_dir = self.project_root / "target" / "release"
@@ -44,11 +48,15 @@ class ServiceUtils:
                 "name": "Content Management Service"
             }
         }
+        # Known service IDs, for cheap membership checks on user input
+        self.service_ids = frozenset(self.services)
+        
+        # Also require {"status": "ok"} in the /health body, not just a 2xx
+        self.strict_health = strict_health
     
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] {level}: {message}")
+        log_message(message, level)
     
     def find_process_by_port(self, port: int) -> Optional[psutil.Process]:
         """Find process running on a specific port"""
@@ -63,6 +71,14 @@ class ServiceUtils:
             self.log(f"Error finding process on port {port}: {e}", "WARNING")
         return None
     
+    def listening_ports(self) -> set:
+        """Return every local port that currently has a listening socket"""
+        try:
+            return {conn.laddr.port for conn in psutil.net_connections(kind='inet') if conn.status == 'LISTEN'}
+        except Exception as e:
+            self.log(f"Error listing listening ports: {e}", "WARNING")
+            return set()
+    
     def find_process_by_name(self, exe_name: str) -> List[psutil.Process]:
         """Find processes by executable name"""
         processes = []
@@ -131,43 +147,36 @@ class ServiceUtils:
         
         return success
     
-    def stop_all_services(self, service_ids: List[str] = None) -> bool:
-        """Stop all Chaos World services or specific services"""
+    def _stop_one(self, service_id: str) -> bool:
+        """Stop one service by port, then by executable name as backup"""
+        config = self.services[service_id]
+        stopped = self.stop_service_by_port(config["port"], config["name"])
+        return self.stop_service_by_name(config["exe"], config["name"]) and stopped
+    
+    async def stop_all_services(self, service_ids: List[str] = None) -> bool:
+        """Stop all Chaos World services or specific services concurrently"""
         if service_ids:
             self.log(f"🛑 Stopping services: {', '.join(service_ids)}...")
         else:
             self.log("🛑 Stopping all Chaos World services...")
-        print("=" * 50)
-        
-        success = True
+        echo("=" * 50)
         
         # If no specific services requested, stop all
         if service_ids is None:
             service_ids = list(self.services.keys())
         
-        # Stop by port first (more reliable)
-        for service_id in service_ids:
-            if service_id in self.services:
-                config = self.services[service_id]
-                if not self.stop_service_by_port(config["port"], config["name"]):
-                    success = False
-        
-        # Also stop by executable name as backup
-        for service_id in service_ids:
-            if service_id in self.services:
-                config = self.services[service_id]
-                if not self.stop_service_by_name(config["exe"], config["name"]):
-                    success = False
-        
-        # Wait a moment for all processes to fully stop
-        time.sleep(2)
+        # Each service is stopped on its own thread; psutil waits block
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self._stop_one, service_id)
+            for service_id in service_ids if service_id in self.services
+        ))
         
-        return success
+        return all(results)
     
-    def build_services(self, service_ids: List[str] = None) -> bool:
+    async def build_services(self, service_ids: List[str] = None) -> bool:
         """Build all services using cargo"""
         self.log("🔨 Building all services...")
-        print("=" * 50)
+        echo("=" * 50)
         
         if not self.target_dir.exists():
             self.log(f"❌ Target directory not found: {self.target_dir}", "ERROR")
@@ -177,47 +186,79 @@ class ServiceUtils:
         if service_ids is None:
             service_ids = list(self.services.keys())
         
-        success = True
+        unknown = [service_id for service_id in service_ids if service_id not in self.services]
+        for service_id in unknown:
+            self.log(f"❌ Unknown service: {service_id}", "ERROR")
+        
+        service_ids = [service_id for service_id in service_ids if service_id in self.services]
+        if not service_ids:
+            return not unknown
         
+        names = ", ".join(self.services[service_id]["name"] for service_id in service_ids)
+        self.log(f"Building {names}...")
+        
+        # One cargo invocation for every binary: the workspace is resolved once
+        # and shared dependencies are compiled once, in parallel
+        cmd = ["cargo", "build", "--release"]
         for service_id in service_ids:
-            if service_id not in self.services:
-                self.log(f"❌ Unknown service: {service_id}", "ERROR")
-                success = False
-                continue
-                
-            config = self.services[service_id]
-            self.log(f"Building {config['name']}...")
-            try:
-                # Build the service
-                result = subprocess.run(
-                    ["cargo", "build", "--release", "--bin", service_id],
-                    cwd=self.project_root,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
-                )
+            cmd += ["--bin", service_id]
+        
+        process = None
+        try:
+            # Cargo's output streams straight to the console: live progress, nothing buffered
+            process = await asyncio.create_subprocess_exec(*cmd, cwd=self.project_root)
+            # 5 minute timeout per service
+            await asyncio.wait_for(process.wait(), timeout=300 * len(service_ids))
+            
+            if process.returncode != 0:
+                self.log(f"❌ Build failed for {names}", "ERROR")
+                return False
+            
+            for service_id in service_ids:
+                self.log(f"✅ {self.services[service_id]['name']} built successfully")
                 
-                if result.returncode == 0:
-                    self.log(f"✅ {config['name']} built successfully")
-                else:
-                    self.log(f"❌ {config['name']} build failed", "ERROR")
-                    if result.stderr:
-                        print(f"Error: {result.stderr}")
-                    success = False
-                    
-            except subprocess.TimeoutExpired:
-                self.log(f"❌ {config['name']} build timed out", "ERROR")
-                success = False
-            except Exception as e:
-                self.log(f"❌ Error building {config['name']}: {e}", "ERROR")
-                success = False
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            self.log(f"❌ Build of {names} timed out", "ERROR")
+            return False
+        except asyncio.CancelledError:
+            # Cancelling the task must not leave cargo running on its own
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+            self.log(f"⏹️  Build of {names} cancelled", "WARNING")
+            raise
+        except Exception as e:
+            self.log(f"❌ Error building {names}: {e}", "ERROR")
+            return False
         
-        return success
+        return not unknown
+    
+    def _copy_config_one(self, service_id: str, configs_dir: Path, target_configs_dir: Path) -> bool:
+        """Replace one service's config directory with a fresh copy"""
+        config = self.services[service_id]
+        source_config_dir = configs_dir / service_id / "configs"
+        target_service_config_dir = target_configs_dir / service_id
+        
+        if not source_config_dir.exists():
+            self.log(f"⚠️  No configs found for {config['name']} at {source_config_dir}", "WARNING")
+            return True
+        
+        try:
+            if target_service_config_dir.exists():
+                shutil.rmtree(target_service_config_dir)
+            shutil.copytree(source_config_dir, target_service_config_dir)
+            self.log(f"✅ Copied configs for {config['name']}")
+            return True
+        except Exception as e:
+            self.log(f"❌ Failed to copy configs for {config['name']}: {e}", "ERROR")
+            return False
     
-    def copy_config_files(self, service_ids: List[str] = None) -> bool:
+    async def copy_config_files(self, service_ids: List[str] = None) -> bool:
         """Copy configuration files to service directory"""
         self.log("📋 Copying configuration files...")
-        print("=" * 50)
+        echo("=" * 50)
         
         configs_dir = self.project_root / "services"
         target_configs_dir = self.service_dir / "configs"
@@ -234,41 +275,61 @@ class ServiceUtils:
                 self.log(f"❌ Failed to create configs directory: {e}", "ERROR")
                 return False
         
-        success = True
-        
         # If no specific services requested, copy all
         if service_ids is None:
             service_ids = list(self.services.keys())
         
-        # Copy config files for each service
-        for service_id in service_ids:
-            if service_id not in self.services:
-                self.log(f"❌ Unknown service: {service_id}", "ERROR")
-                success = False
-                continue
-                
-            config = self.services[service_id]
-            source_config_dir = configs_dir / service_id / "configs"
-            target_service_config_dir = target_configs_dir / service_id
-            
-            if source_config_dir.exists():
-                try:
-                    if target_service_config_dir.exists():
-                        shutil.rmtree(target_service_config_dir)
-                    shutil.copytree(source_config_dir, target_service_config_dir)
-                    self.log(f"✅ Copied configs for {config['name']}")
-                except Exception as e:
-                    self.log(f"❌ Failed to copy configs for {config['name']}: {e}", "ERROR")
-                    success = False
-            else:
-                self.log(f"⚠️  No configs found for {config['name']} at {source_config_dir}", "WARNING")
+        unknown = [service_id for service_id in service_ids if service_id not in self.services]
+        for service_id in unknown:
+            self.log(f"❌ Unknown service: {service_id}", "ERROR")
         
-        return success
+        # Each service has its own config directory, so copy them concurrently
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self._copy_config_one, service_id, configs_dir, target_configs_dir)
+            for service_id in service_ids if service_id in self.services
+        ))
+        
+        return not unknown and all(results)
+    
+    @staticmethod
+    def _needs_copy(source_path: Path, dest_path: Path) -> bool:
+        """True unless dest already matches source in size and mtime"""
+        try:
+            dest_stat = dest_path.stat()
+        except FileNotFoundError:
+            return True
+        source_stat = source_path.stat()
+        return dest_stat.st_size != source_stat.st_size or dest_stat.st_mtime_ns != source_stat.st_mtime_ns
+    
+    def _copy_service_one(self, service_id: str) -> bool:
+        """Copy one built executable into the service directory"""
+        config = self.services[service_id]
+        source_path = self.target_dir / config["exe"]
+        dest_path = self.service_dir / config["exe"]
+        
+        if not source_path.exists():
+            self.log(f"❌ Source file not found: {source_path}", "ERROR")
+            return False
+        
+        try:
+            # A no-op build leaves the binary untouched, so skip the copy
+            if not self._needs_copy(source_path, dest_path):
+                self.log(f"⏭️  {config['name']} unchanged")
+                return True
+            
+            # copy2 carries the source mtime over, which _needs_copy compares against
+            shutil.copy2(source_path, dest_path)
+            size = dest_path.stat().st_size
+            self.log(f"✅ Copied {config['name']} ({size:,} bytes)")
+            return True
+        except Exception as e:
+            self.log(f"❌ Failed to copy {config['name']}: {e}", "ERROR")
+            return False
     
-    def copy_services(self, service_ids: List[str] = None) -> bool:
+    async def copy_services(self, service_ids: List[str] = None) -> bool:
         """Copy built executables to service directory"""
         self.log("📦 Copying service executables...")
-        print("=" * 50)
+        echo("=" * 50)
         
         if not self.target_dir.exists():
             self.log(f"❌ Target directory not found: {self.target_dir}", "ERROR")
@@ -283,32 +344,17 @@ class ServiceUtils:
         if service_ids is None:
             service_ids = list(self.services.keys())
         
-        success = True
+        unknown = [service_id for service_id in service_ids if service_id not in self.services]
+        for service_id in unknown:
+            self.log(f"❌ Unknown service: {service_id}", "ERROR")
         
-        for service_id in service_ids:
-            if service_id not in self.services:
-                self.log(f"❌ Unknown service: {service_id}", "ERROR")
-                success = False
-                continue
-                
-            config = self.services[service_id]
-            source_path = self.target_dir / config["exe"]
-            dest_path = self.service_dir / config["exe"]
-            
-            if source_path.exists():
-                try:
-                    # Copy the file
-                    shutil.copy2(source_path, dest_path)
-                    size = dest_path.stat().st_size
-                    self.log(f"✅ Copied {config['name']} ({size:,} bytes)")
-                except Exception as e:
-                    self.log(f"❌ Failed to copy {config['name']}: {e}", "ERROR")
-                    success = False
-            else:
-                self.log(f"❌ Source file not found: {source_path}", "ERROR")
-                success = False
+        # Executables are independent files, so copy them concurrently
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self._copy_service_one, service_id)
+            for service_id in service_ids if service_id in self.services
+        ))
         
-        return success
+        return not unknown and all(results)
     
     def start_service(self, service_id: str) -> bool:
         """Start a specific service"""
@@ -359,36 +405,43 @@ class ServiceUtils:
                 stdout, stderr = process.communicate()
                 self.log(f"❌ {config['name']} failed to start", "ERROR")
                 if stderr:
-                    print(f"Error: {stderr.decode()}")
+                    echo(f"Error: {stderr.decode()}")
                 return False
                 
         except Exception as e:
             self.log(f"❌ Error starting {config['name']}: {e}", "ERROR")
             return False
     
-    def start_all_services(self, service_ids: List[str] = None) -> bool:
-        """Start all Chaos World services or specific services"""
+    async def start_all_services(self, service_ids: List[str] = None) -> bool:
+        """Start all Chaos World services or specific services, backends first"""
         if service_ids:
             self.log(f"🚀 Starting services: {', '.join(service_ids)}...")
         else:
             self.log("🚀 Starting all Chaos World services...")
-        print("=" * 50)
-        
-        success = True
+        echo("=" * 50)
         
-        # If no specific services requested, start all in order
+        # If no specific services requested, start all
         if service_ids is None:
-            start_order = ["user-management", "chaos-backend", "content-management-service", "api-gateway"]
-        else:
-            start_order = service_ids
-        
-        for service_id in start_order:
-            if not self.start_service(service_id):
-                success = False
-                break  # Stop if any service fails to start
-            time.sleep(1)  # Small delay between starts
-        
-        return success
+            service_ids = ["user-management", "chaos-backend", "content-management-service", "api-gateway"]
+        
+        # The gateway proxies to the backends, so it starts last as its own tier;
+        # the backends don't depend on each other and start side by side
+        backends = [service_id for service_id in service_ids if service_id != "api-gateway"]
+        start_gateway = "api-gateway" in service_ids
+        
+        if backends:
+            results = await asyncio.gather(*(
+                asyncio.to_thread(self.start_service, service_id) for service_id in backends
+            ))
+            if not all(results):
+                return False  # Stop if any service fails to start
+        
+        if start_gateway:
+            if backends:
+                await asyncio.sleep(1)  # Small delay before the gateway connects to them
+            return await asyncio.to_thread(self.start_service, "api-gateway")
+        
+        return True
     
     def check_service_health(self, service_id: str) -> bool:
         """Check if a service is healthy by testing its port"""
@@ -399,27 +452,51 @@ class ServiceUtils:
         try:
             import requests
             response = requests.get(f"http://localhost:{config['port']}/health", timeout=5)
-            return response.status_code == 200
+            return is_healthy_response(response, self.strict_health)
         except:
             return False
     
-    def get_service_status(self) -> Dict[str, bool]:
-        """Get status of all services"""
+    def get_service_status(self, service_ids: List[str] = None) -> Dict[str, bool]:
+        """Get status of all services, or only of service_ids"""
+        if service_ids is None:
+            service_ids = self.services.keys()
         status = {}
-        for service_id, config in self.services.items():
+        for service_id in service_ids:
             status[service_id] = self.check_service_health(service_id)
         return status
     
-    def wait_for_services(self, service_ids: List[str] = None, timeout: int = 30) -> bool:
-        """Wait for services to become healthy"""
+    def get_service_status_concurrent(self, service_ids: List[str] = None) -> Dict[str, bool]:
+        """Get status of all services, or only of service_ids, checking every /health endpoint at once"""
+        service_ids = list(self.services if service_ids is None else service_ids)
+        with ThreadPoolExecutor(max_workers=max(len(service_ids), 1)) as executor:
+            return dict(zip(service_ids, executor.map(self.check_service_health, service_ids)))
+    
+    async def wait_until_stopped(self, service_ids: List[str] = None, timeout: float = 10, poll: float = 0.1) -> bool:
+        """Wait until no service in service_ids is listening on its port"""
+        if service_ids is None:
+            service_ids = list(self.services.keys())
+        ports = {self.services[service_id]["port"] for service_id in service_ids if service_id in self.services}
+        
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not ports & await asyncio.to_thread(self.listening_ports):
+                return True
+            await asyncio.sleep(poll)
+        
+        self.log("⚠️  Timeout waiting for service ports to be released", "WARNING")
+        return False
+    
+    async def wait_for_services(self, service_ids: List[str] = None, timeout: int = 30, poll: float = 0.25) -> bool:
+        """Wait for services to become healthy, polling with exponential backoff"""
         if service_ids:
             self.log(f"⏳ Waiting for services to become healthy: {', '.join(service_ids)} (timeout: {timeout}s)...")
         else:
             self.log(f"⏳ Waiting for all services to become healthy (timeout: {timeout}s)...")
         
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            status = self.get_service_status()
+        delay = poll
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = await asyncio.to_thread(self.get_service_status_concurrent, service_ids)
             
             if service_ids:
                 # Check only specific services
@@ -435,7 +512,8 @@ class ServiceUtils:
                 return True
             
             self.log(f"Health check: {healthy_count}/{total_count} services healthy")
-            time.sleep(2)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
         
         self.log("❌ Timeout waiting for services to become healthy", "ERROR")
         return False
@@ -8,129 +8,190 @@ import os
 import sys
 import subprocess
 import shutil
+import functools
 import json
 import time
+import psutil
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import yaml
+from monitoring_config import (
+    DATASOURCE_PROVISIONING_FILE, DASHBOARD_PROVISIONING_FILE,
+    datasource_provisioning, dashboard_provisioning, write_if_changed,
+)
+
+try:
+    # C-implemented encoder that returns bytes directly
+    import orjson
+except ImportError:
+    orjson = None
+
+# Chocolatey install locations
+GRAFANA_ROOT = r"C:\ProgramData\chocolatey\lib\grafana\tools\grafana-11.5.8"
+PROMETHEUS_ROOT = r"C:\ProgramData\chocolatey\lib\prometheus\tools\prometheus-2.2.1.windows-amd64"
+GRAFANA_EXE = str(Path(GRAFANA_ROOT) / "bin" / "grafana-server.exe")
+PROMETHEUS_EXE = str(Path(PROMETHEUS_ROOT) / "prometheus.exe")
+
+# Avoid allocating a console window for each spawned daemon on Windows
+NO_WINDOW = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+
+# Services scraped by Prometheus: (job name, port, service label)
+SCRAPE_SERVICES = [
+    ("chaos-world-api-gateway", 8080, "api-gateway"),
+    ("chaos-world-backend", 8081, "chaos-backend"),
+    ("chaos-world-cms", 9090, "content-management"),
+]
+
+# prometheus.yml has a fixed shape, so it is rendered from text templates
+# rather than built as a dict and run through a serializer
+SCRAPE_JOB_TMPL = """\
+  - job_name: {job}
+    static_configs:
+      - targets: ['localhost:{port}']
+        labels:
+          service: {service}
+          environment: development
+          team: backend
+    metrics_path: /metrics
+    scrape_interval: 5s
+    scrape_timeout: 5s
+"""
+
+PROMETHEUS_YAML_TMPL = """\
+global:
+  scrape_interval: 15s
+  evaluation_interval: 15s
+  external_labels:
+    cluster: chaos-world
+    environment: development
+rule_files:
+  - '{rule_files}'
+scrape_configs:
+{scrape_jobs}\
+  - job_name: prometheus
+    static_configs:
+      - targets: ['localhost:{prometheus_port}']
+        labels:
+          service: prometheus
+          environment: development
+    scrape_interval: 15s
+alerting:
+  alertmanagers:
+    - static_configs:
+        - targets: ['localhost:9093']
+"""
+
+# Request latency histogram shared by the percentile panels
+CMS_LATENCY_BUCKETS = "rate(cms_request_duration_seconds_bucket[5m])"
+
+@functools.lru_cache(maxsize=None)
+def _target(expr, legend):
+    """Shared Grafana target dict; identical queries reuse the same object"""
+    return {"expr": expr, "legendFormat": legend}
+
+def _percentile_target(quantile, legend):
+    """Target for a CMS request latency percentile"""
+    return _target(f"histogram_quantile({quantile}, {CMS_LATENCY_BUCKETS})", legend)
+
+def _panel(panel_id, title, targets, grid_pos, panel_type="graph", **extra):
+    """Build a Grafana panel from shared target fragments"""
+    panel = {"id": panel_id, "title": title, "type": panel_type, "targets": list(targets)}
+    panel.update(extra)
+    panel["gridPos"] = grid_pos
+    return panel
+
+def _dashboard(title, tags, panels):
+    """Wrap panels in the dashboard envelope used by both dashboards"""
+    return {
+        "dashboard": {
+            "id": None,
+            "title": title,
+            "tags": tags,
+            "timezone": "browser",
+            "panels": panels,
+            "time": {
+                "from": "now-1h",
+                "to": "now"
+            },
+            "refresh": "5s"
+        }
+    }
 
 class CompleteMonitoringSetup:
-    def __init__(self):
-        self.grafana_path = r"C:\ProgramData\chocolatey\lib\grafana\tools\grafana-11.5.8"
-        self.prometheus_path = r"C:\ProgramData\chocolatey\lib\prometheus\tools\prometheus-2.2.1.windows-amd64"
+    def __init__(self, debug=False):
         self.config_dir = Path("C:/ChaosWorld/monitoring")
+        self.prom_dir = self.config_dir / "prometheus"
+        self.prom_rules_dir = self.prom_dir / "rules"
+        self.prom_config_file = self.prom_dir / "prometheus.yml"
+        self.graf_dir = self.config_dir / "grafana"
+        self.graf_dashboards_dir = self.graf_dir / "dashboards"
+        self.graf_provisioning_dir = self.graf_dir / "provisioning"
         self.prometheus_port = 9091
         self.grafana_port = 3001
-        
+        self._prom_url = f"http://localhost:{self.prometheus_port}"
+        self._graf_url = f"http://localhost:{self.grafana_port}"
+        # Leaf directories written to by the create_* methods
+        self._all_dirs = [
+            self.prom_rules_dir,
+            self.graf_dashboards_dir,
+            self.graf_provisioning_dir / "datasources",
+            self.graf_provisioning_dir / "dashboards",
+        ]
+        # One keep-alive session shared by every probe and API call
+        self._http = requests.Session()
+        self._http.headers["Connection"] = "keep-alive"
+        # Pretty-print generated dashboards for human inspection
+        self.debug = debug
+    
+    def _dashboard_bytes(self, dashboard):
+        """Serialize a dashboard compactly, or indented in debug mode"""
+        if orjson is not None:
+            return orjson.dumps(dashboard, option=orjson.OPT_INDENT_2 if self.debug else 0)
+        if self.debug:
+            return json.dumps(dashboard, indent=2).encode()
+        return json.dumps(dashboard, separators=(",", ":")).encode()
+    
+    def _ensure_dirs(self):
+        """Create every output directory once, up front"""
+        for directory in self._all_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+    
+    def _is_up(self, url):
+        """Check whether an HTTP endpoint answers with 200"""
+        try:
+            return self._http.get(url, timeout=2).status_code == 200
+        except requests.RequestException:
+            return False
+    
     def create_prometheus_config(self):
         """Create comprehensive Prometheus configuration"""
         print("⚙️ Creating comprehensive Prometheus configuration...")
         
-        config = {
-            "global": {
-                "scrape_interval": "15s",
-                "evaluation_interval": "15s",
-                "external_labels": {
-                    "cluster": "chaos-world",
-                    "environment": "development"
-                }
-            },
-            "rule_files": [
-                str(self.config_dir / "prometheus" / "rules" / "*.yml")
-            ],
-            "scrape_configs": [
-                {
-                    "job_name": "chaos-world-api-gateway",
-                    "static_configs": [
-                        {
-                            "targets": ["localhost:8080"],
-                            "labels": {
-                                "service": "api-gateway",
-                                "environment": "development",
-                                "team": "backend"
-                            }
-                        }
-                    ],
-                    "metrics_path": "/metrics",
-                    "scrape_interval": "5s",
-                    "scrape_timeout": "5s"
-                },
-                {
-                    "job_name": "chaos-world-backend",
-                    "static_configs": [
-                        {
-                            "targets": ["localhost:8081"],
-                            "labels": {
-                                "service": "chaos-backend",
-                                "environment": "development",
-                                "team": "backend"
-                            }
-                        }
-                    ],
-                    "metrics_path": "/metrics",
-                    "scrape_interval": "5s",
-                    "scrape_timeout": "5s"
-                },
-                {
-                    "job_name": "chaos-world-cms",
-                    "static_configs": [
-                        {
-                            "targets": ["localhost:9090"],
-                            "labels": {
-                                "service": "content-management",
-                                "environment": "development",
-                                "team": "backend"
-                            }
-                        }
-                    ],
-                    "metrics_path": "/metrics",
-                    "scrape_interval": "5s",
-                    "scrape_timeout": "5s"
-                },
-                {
-                    "job_name": "prometheus",
-                    "static_configs": [
-                        {
-                            "targets": [f"localhost:{self.prometheus_port}"],
-                            "labels": {
-                                "service": "prometheus",
-                                "environment": "development"
-                            }
-                        }
-                    ],
-                    "scrape_interval": "15s"
-                }
-            ],
-            "alerting": {
-                "alertmanagers": [
-                    {
-                        "static_configs": [
-                            {
-                                "targets": ["localhost:9093"]
-                            }
-                        ]
-                    }
-                ]
-            }
-        }
-        
-        # Create rules directory
-        rules_dir = self.config_dir / "prometheus" / "rules"
-        rules_dir.mkdir(parents=True, exist_ok=True)
+        scrape_jobs = "".join(
+            SCRAPE_JOB_TMPL.format(job=job, port=port, service=service)
+            for job, port, service in SCRAPE_SERVICES
+        )
+        config = PROMETHEUS_YAML_TMPL.format(
+            rule_files=str(self.prom_rules_dir / "*.yml").replace("'", "''"),
+            scrape_jobs=scrape_jobs,
+            prometheus_port=self.prometheus_port,
+        )
         
         # Write main config
-        config_file = self.config_dir / "prometheus" / "prometheus.yml"
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        config_file = self.prom_config_file
+        changed = write_if_changed(config_file, config.encode())
         
-        print(f"✅ Prometheus config created: {config_file}")
-        return config_file
+        if changed:
+            print(f"✅ Prometheus config created: {config_file}")
+        else:
+            print(f"✅ Prometheus config unchanged: {config_file}")
+        return changed
     
     def create_alerting_rules(self):
         """Create Prometheus alerting rules"""
         print("🚨 Creating alerting rules...")
         
-        rules_dir = self.config_dir / "prometheus" / "rules"
+        rules_dir = self.prom_rules_dir
         
         # Service down alerts
         service_down_rules = {
@@ -180,332 +241,214 @@ class CompleteMonitoringSetup:
         }
         
         rules_file = rules_dir / "chaos-world-alerts.yml"
-        with open(rules_file, 'w') as f:
-            yaml.dump(service_down_rules, f, default_flow_style=False)
+        changed = write_if_changed(rules_file, json.dumps(service_down_rules, separators=(",", ":")).encode())
         
-        print(f"✅ Alerting rules created: {rules_file}")
+        if changed:
+            print(f"✅ Alerting rules created: {rules_file}")
+        else:
+            print(f"✅ Alerting rules unchanged: {rules_file}")
+        return changed
     
     def create_grafana_dashboards(self):
         """Create Grafana dashboards"""
         print("📊 Creating Grafana dashboards...")
         
-        dashboards_dir = self.config_dir / "grafana" / "dashboards"
-        dashboards_dir.mkdir(parents=True, exist_ok=True)
+        dashboards_dir = self.graf_dashboards_dir
         
         # Main Chaos World Overview Dashboard
-        overview_dashboard = {
-            "dashboard": {
-                "id": None,
-                "title": "Chaos World - Service Overview",
-                "tags": ["chaos-world", "overview"],
-                "timezone": "browser",
-                "panels": [
-                    {
-                        "id": 1,
-                        "title": "Service Status",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "up",
-                                "legendFormat": "{{job}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "thresholds"
-                                },
-                                "thresholds": {
-                                    "steps": [
-                                        {"color": "red", "value": 0},
-                                        {"color": "green", "value": 1}
-                                    ]
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 0}
-                    },
-                    {
-                        "id": 2,
-                        "title": "Request Rate",
-                        "type": "graph",
-                        "targets": [
-                            {
-                                "expr": "rate(cms_request_duration_seconds_count[5m])",
-                                "legendFormat": "{{job}} requests/sec"
-                            }
-                        ],
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 0}
-                    },
-                    {
-                        "id": 3,
-                        "title": "Response Time",
-                        "type": "graph",
-                        "targets": [
-                            {
-                                "expr": "histogram_quantile(0.95, rate(cms_request_duration_seconds_bucket[5m]))",
-                                "legendFormat": "95th percentile"
-                            },
-                            {
-                                "expr": "histogram_quantile(0.50, rate(cms_request_duration_seconds_bucket[5m]))",
-                                "legendFormat": "50th percentile"
-                            }
-                        ],
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 8}
-                    },
-                    {
-                        "id": 4,
-                        "title": "Error Rate",
-                        "type": "graph",
-                        "targets": [
-                            {
-                                "expr": "rate(cms_errors_total[5m])",
-                                "legendFormat": "{{job}} errors/sec"
-                            }
-                        ],
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 16}
-                    },
-                    {
-                        "id": 5,
-                        "title": "Active Connections",
-                        "type": "graph",
-                        "targets": [
-                            {
-                                "expr": "cms_active_connections",
-                                "legendFormat": "Active Connections"
-                            }
-                        ],
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 16}
-                    }
-                ],
-                "time": {
-                    "from": "now-1h",
-                    "to": "now"
-                },
-                "refresh": "5s"
-            }
-        }
+        overview_dashboard = _dashboard("Chaos World - Service Overview", ["chaos-world", "overview"], [
+            _panel(1, "Service Status", [_target("up", "{{job}}")],
+                   {"h": 8, "w": 12, "x": 0, "y": 0}, panel_type="stat",
+                   fieldConfig={
+                       "defaults": {
+                           "color": {
+                               "mode": "thresholds"
+                           },
+                           "thresholds": {
+                               "steps": [
+                                   {"color": "red", "value": 0},
+                                   {"color": "green", "value": 1}
+                               ]
+                           }
+                       }
+                   }),
+            _panel(2, "Request Rate",
+                   [_target("rate(cms_request_duration_seconds_count[5m])", "{{job}} requests/sec")],
+                   {"h": 8, "w": 12, "x": 12, "y": 0}),
+            _panel(3, "Response Time",
+                   [_percentile_target("0.95", "95th percentile"), _percentile_target("0.50", "50th percentile")],
+                   {"h": 8, "w": 24, "x": 0, "y": 8}),
+            _panel(4, "Error Rate", [_target("rate(cms_errors_total[5m])", "{{job}} errors/sec")],
+                   {"h": 8, "w": 12, "x": 0, "y": 16}),
+            _panel(5, "Active Connections", [_target("cms_active_connections", "Active Connections")],
+                   {"h": 8, "w": 12, "x": 12, "y": 16}),
+        ])
         
         # Save overview dashboard
         overview_file = dashboards_dir / "chaos-world-overview.json"
-        with open(overview_file, 'w') as f:
-            json.dump(overview_dashboard, f, indent=2)
+        changed = write_if_changed(overview_file, self._dashboard_bytes(overview_dashboard))
         
         # CMS Detailed Dashboard
-        cms_dashboard = {
-            "dashboard": {
-                "id": None,
-                "title": "Chaos World - CMS Service Details",
-                "tags": ["chaos-world", "cms", "detailed"],
-                "timezone": "browser",
-                "panels": [
-                    {
-                        "id": 1,
-                        "title": "HTTP Request Duration",
-                        "type": "graph",
-                        "targets": [
-                            {
-                                "expr": "histogram_quantile(0.99, rate(cms_request_duration_seconds_bucket[5m]))",
-                                "legendFormat": "99th percentile"
-                            },
-                            {
-                                "expr": "histogram_quantile(0.95, rate(cms_request_duration_seconds_bucket[5m]))",
-                                "legendFormat": "95th percentile"
-                            },
-                            {
-                                "expr": "histogram_quantile(0.50, rate(cms_request_duration_seconds_bucket[5m]))",
-                                "legendFormat": "50th percentile"
-                            }
-                        ],
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 0}
-                    },
-                    {
-                        "id": 2,
-                        "title": "Database Queries",
-                        "type": "graph",
-                        "targets": [
-                            {
-                                "expr": "rate(cms_database_queries_total[5m])",
-                                "legendFormat": "Queries/sec"
-                            }
-                        ],
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 8}
-                    },
-                    {
-                        "id": 3,
-                        "title": "Cache Performance",
-                        "type": "graph",
-                        "targets": [
-                            {
-                                "expr": "rate(cms_cache_hits_total[5m])",
-                                "legendFormat": "Cache Hits/sec"
-                            },
-                            {
-                                "expr": "rate(cms_cache_misses_total[5m])",
-                                "legendFormat": "Cache Misses/sec"
-                            }
-                        ],
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 8}
-                    },
-                    {
-                        "id": 4,
-                        "title": "Error Count",
-                        "type": "graph",
-                        "targets": [
-                            {
-                                "expr": "cms_errors_total",
-                                "legendFormat": "Total Errors"
-                            }
-                        ],
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 16}
-                    }
-                ],
-                "time": {
-                    "from": "now-1h",
-                    "to": "now"
-                },
-                "refresh": "5s"
-            }
-        }
+        cms_dashboard = _dashboard("Chaos World - CMS Service Details", ["chaos-world", "cms", "detailed"], [
+            _panel(1, "HTTP Request Duration",
+                   [_percentile_target("0.99", "99th percentile"), _percentile_target("0.95", "95th percentile"),
+                    _percentile_target("0.50", "50th percentile")],
+                   {"h": 8, "w": 24, "x": 0, "y": 0}),
+            _panel(2, "Database Queries", [_target("rate(cms_database_queries_total[5m])", "Queries/sec")],
+                   {"h": 8, "w": 12, "x": 0, "y": 8}),
+            _panel(3, "Cache Performance",
+                   [_target("rate(cms_cache_hits_total[5m])", "Cache Hits/sec"),
+                    _target("rate(cms_cache_misses_total[5m])", "Cache Misses/sec")],
+                   {"h": 8, "w": 12, "x": 12, "y": 8}),
+            _panel(4, "Error Count", [_target("cms_errors_total", "Total Errors")],
+                   {"h": 8, "w": 24, "x": 0, "y": 16}),
+        ])
         
         # Save CMS dashboard
         cms_file = dashboards_dir / "chaos-world-cms.json"
-        with open(cms_file, 'w') as f:
-            json.dump(cms_dashboard, f, indent=2)
+        changed |= write_if_changed(cms_file, self._dashboard_bytes(cms_dashboard))
         
-        print(f"✅ Dashboards created in: {dashboards_dir}")
+        if changed:
+            print(f"✅ Dashboards created in: {dashboards_dir}")
+        else:
+            print(f"✅ Dashboards unchanged in: {dashboards_dir}")
+        return changed
     
     def create_grafana_provisioning(self):
         """Create Grafana provisioning configuration"""
         print("🔧 Creating Grafana provisioning...")
         
-        provisioning_dir = self.config_dir / "grafana" / "provisioning"
-        provisioning_dir.mkdir(parents=True, exist_ok=True)
+        provisioning_dir = self.graf_provisioning_dir
         
-        # Datasources provisioning
-        datasources_config = {
-            "apiVersion": 1,
-            "datasources": [
-                {
-                    "name": "Prometheus",
-                    "type": "prometheus",
-                    "url": f"http://localhost:{self.prometheus_port}",
-                    "access": "proxy",
-                    "isDefault": True,
-                    "editable": True
-                }
-            ]
-        }
-        
-        datasources_file = provisioning_dir / "datasources" / "prometheus.yml"
-        datasources_file.parent.mkdir(exist_ok=True)
-        with open(datasources_file, 'w') as f:
-            yaml.dump(datasources_config, f, default_flow_style=False)
-        
-        # Dashboards provisioning
-        dashboards_config = {
-            "apiVersion": 1,
-            "providers": [
-                {
-                    "name": "chaos-world-dashboards",
-                    "type": "file",
-                    "options": {
-                        "path": str(self.config_dir / "grafana" / "dashboards")
-                    }
-                }
-            ]
-        }
+        datasources_file = provisioning_dir / DATASOURCE_PROVISIONING_FILE
+        changed = write_if_changed(datasources_file, datasource_provisioning(self._prom_url))
         
-        dashboards_file = provisioning_dir / "dashboards" / "chaos-world.yml"
-        dashboards_file.parent.mkdir(exist_ok=True)
-        with open(dashboards_file, 'w') as f:
-            yaml.dump(dashboards_config, f, default_flow_style=False)
+        dashboards_file = provisioning_dir / DASHBOARD_PROVISIONING_FILE
+        changed |= write_if_changed(dashboards_file, dashboard_provisioning(self.graf_dashboards_dir))
         
-        print(f"✅ Grafana provisioning created in: {provisioning_dir}")
+        if changed:
+            print(f"✅ Grafana provisioning created in: {provisioning_dir}")
+        else:
+            print(f"✅ Grafana provisioning unchanged in: {provisioning_dir}")
+        return changed
+    
+    def _wait_ready(self, url, timeout=30):
+        """Poll an HTTP endpoint until it answers 200 or the timeout expires"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if self._http.get(url, timeout=0.5).status_code == 200:
+                    return True
+            except requests.RequestException:
+                pass
+            time.sleep(0.1)
+        return False
+    
+    def reload_prometheus(self):
+        """Ask the running Prometheus to reload its config via the lifecycle API"""
+        try:
+            response = self._http.post(f"{self._prom_url}/-/reload", timeout=5)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
     
     def restart_services(self):
         """Restart Prometheus and Grafana with new configuration"""
         print("🔄 Restarting services with new configuration...")
         
-        # Kill existing processes
+        # Kill existing processes, skipping taskkill for ones that aren't running
         try:
-            subprocess.run(["taskkill", "/F", "/IM", "prometheus.exe"], 
-                         capture_output=True, check=False)
-            subprocess.run(["taskkill", "/F", "/IM", "grafana-server.exe"], 
-                         capture_output=True, check=False)
-            time.sleep(3)
-        except:
-            pass
+            running = {p.info['name'] for p in psutil.process_iter(['name'])}
+            killed = False
+            for exe_name in ("prometheus.exe", "grafana-server.exe"):
+                if exe_name in running:
+                    subprocess.run(["taskkill", "/F", "/IM", exe_name],
+                                 capture_output=True, check=False, creationflags=NO_WINDOW)
+                    killed = True
+            if killed:
+                time.sleep(3)
+        except (OSError, psutil.Error) as e:
+            print(f"⚠️ Could not stop existing processes: {e}")
         
         # Start Prometheus
-        prometheus_exe = Path(self.prometheus_path) / "prometheus.exe"
-        config_file = self.config_dir / "prometheus" / "prometheus.yml"
-        
         cmd = [
-            str(prometheus_exe),
-            f"--config.file={config_file}",
+            PROMETHEUS_EXE,
+            f"--config.file={self.prom_config_file}",
             f"--web.listen-address=0.0.0.0:{self.prometheus_port}",
-            f"--storage.tsdb.path={self.config_dir / 'prometheus' / 'data'}",
+            f"--storage.tsdb.path={self.prom_dir / 'data'}",
             "--web.enable-lifecycle"
         ]
         
-        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        time.sleep(5)
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=NO_WINDOW)
+        if not self._wait_ready(f"{self._prom_url}/-/ready"):
+            print("⚠️ Prometheus did not become ready in time")
         
         # Start Grafana
-        grafana_exe = Path(self.grafana_path) / "bin" / "grafana-server.exe"
-        custom_config = self.config_dir / "grafana" / "grafana.ini"
+        custom_config = self.graf_dir / "grafana.ini"
         
         cmd = [
-            str(grafana_exe),
+            GRAFANA_EXE,
             f"--config={custom_config}",
-            f"--homepath={self.grafana_path}"
+            f"--homepath={GRAFANA_ROOT}"
         ]
         
-        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        time.sleep(10)
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=NO_WINDOW)
+        if not self._wait_ready(f"{self._graf_url}/api/health"):
+            print("⚠️ Grafana did not become ready in time")
         
         print("✅ Services restarted")
     
+    def _probe_all(self, urls, timeout=10):
+        """GET all URLs concurrently; returns completed futures in the same order"""
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            return [executor.submit(self._http.get, url, timeout=timeout) for url in urls]
+    
     def test_setup(self):
         """Test the complete monitoring setup"""
         print("🧪 Testing complete monitoring setup...")
         
+        # Issue all probes at once so the wait is bounded by the slowest one
+        prometheus_probe, grafana_probe, targets_probe = self._probe_all([
+            self._prom_url,
+            self._graf_url,
+            f"{self._prom_url}/api/v1/targets?state=active",
+        ])
+        
         # Test Prometheus
         try:
-            response = requests.get(f"http://localhost:{self.prometheus_port}", timeout=10)
+            response = prometheus_probe.result()
             if response.status_code == 200:
                 print("✅ Prometheus is running")
             else:
                 print("❌ Prometheus not responding")
                 return False
-        except:
-            print("❌ Prometheus not accessible")
+        except requests.RequestException as e:
+            print(f"❌ Prometheus not accessible: {e}")
             return False
         
         # Test Grafana
         try:
-            response = requests.get(f"http://localhost:{self.grafana_port}", timeout=10)
+            response = grafana_probe.result()
             if response.status_code == 200:
                 print("✅ Grafana is running")
             else:
                 print("❌ Grafana not responding")
                 return False
-        except:
-            print("❌ Grafana not accessible")
+        except requests.RequestException as e:
+            print(f"❌ Grafana not accessible: {e}")
             return False
         
         # Test targets in Prometheus
         try:
-            response = requests.get(f"http://localhost:{self.prometheus_port}/api/v1/targets", timeout=10)
+            response = targets_probe.result()
             if response.status_code == 200:
-                targets = response.json()
-                active_targets = [t for t in targets['data']['activeTargets'] if t['health'] == 'up']
-                print(f"✅ Prometheus has {len(active_targets)} active targets")
+                active_targets = response.json()['data']['activeTargets']
+                up_count = sum(1 for target in active_targets if target['health'] == 'up')
+                print(f"✅ Prometheus has {up_count} active targets")
             else:
                 print("⚠️ Could not check Prometheus targets")
-        except:
-            print("⚠️ Could not check Prometheus targets")
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"⚠️ Could not check Prometheus targets: {e}")
         
         return True
     
@@ -514,20 +457,34 @@ class CompleteMonitoringSetup:
         print("🔧 Setting up Complete Chaos World Monitoring")
         print("=" * 60)
         
-        # Create all configurations
-        self.create_prometheus_config()
-        self.create_alerting_rules()
-        self.create_grafana_dashboards()
-        self.create_grafana_provisioning()
-        
-        # Restart services
-        self.restart_services()
+        self._ensure_dirs()
+        
+        # Create all configurations; the generators are independent file writes
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            prometheus_config, alerting_rules, dashboards, provisioning = executor.map(
+                lambda create: create(),
+                [self.create_prometheus_config, self.create_alerting_rules,
+                 self.create_grafana_dashboards, self.create_grafana_provisioning]
+            )
+        prometheus_changed = prometheus_config or alerting_rules
+        grafana_changed = dashboards or provisioning
+        
+        # Restart services only when needed; Prometheus can hot-reload its config
+        services_up = self._is_up(self._prom_url) and self._is_up(self._graf_url)
+        if grafana_changed or not services_up:
+            self.restart_services()
+        elif not prometheus_changed:
+            print("✅ Configuration unchanged, services already running")
+        elif self.reload_prometheus():
+            print("✅ Prometheus configuration reloaded")
+        else:
+            self.restart_services()
         
         # Test setup
         if self.test_setup():
             print("\n🎉 Complete monitoring setup finished!")
-            print(f"📊 Prometheus: http://localhost:{self.prometheus_port}")
-            print(f"📈 Grafana: http://localhost:{self.grafana_port}")
+            print(f"📊 Prometheus: {self._prom_url}")
+            print(f"📈 Grafana: {self._graf_url}")
             print("🔑 Grafana login: admin / admin")
             print("\n📋 What's included:")
             print("  • Service status monitoring")
@@ -543,7 +500,7 @@ class CompleteMonitoringSetup:
 
 def main():
     """Main function"""
-    setup = CompleteMonitoringSetup()
+    setup = CompleteMonitoringSetup(debug="--debug" in sys.argv[1:])
     success = setup.run_complete_setup()
     
     if success:
@@ -4,23 +4,48 @@ Manual Grafana Setup
 Set up datasources and dashboards manually via API
 """
 
+import sys
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from monitoring_config import SIMPLE_DASHBOARD
+
+# (connect, read) timeouts: short for readiness probes, long for API writes
+PROBE_TIMEOUT = (2, 5)
+API_TIMEOUT = (5, 30)
+
+# Pooled keep-alive session shared by every Grafana call; transient
+# 502/503/504s from a still-starting Grafana are retried with backoff
+SESSION = requests.Session()
+SESSION.auth = ("admin", "admin123")
+SESSION.headers["Content-Type"] = "application/json"
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
 
 def wait_for_grafana():
     """Wait for Grafana to be ready"""
     print("⏳ Waiting for Grafana to be ready...")
-    for i in range(30):  # Wait up to 30 seconds
+    # Back off exponentially: fast success when Grafana is already up,
+    # fewer probes when it is slow to start
+    delay = 0.1
+    deadline = time.monotonic() + 30  # Wait up to 30 seconds
+    while time.monotonic() < deadline:
         try:
-            response = requests.get("http://localhost:3001", timeout=5)
+            response = SESSION.get("http://127.0.0.1:3001/api/health", timeout=PROBE_TIMEOUT)
             if response.status_code == 200:
                 print("✅ Grafana is ready!")
                 return True
-        except:
+        except requests.RequestException:
             pass
-        time.sleep(1)
-        print(f"   Waiting... ({i+1}/30)")
+        print(f"   Waiting... (next probe in {delay:.1f}s)")
+        time.sleep(delay)
+        delay = min(delay * 2, 5.0)
     
     print("❌ Grafana not ready after 30 seconds")
     return False
@@ -32,29 +57,29 @@ def setup_datasource():
     datasource_config = {
         "name": "Prometheus",
         "type": "prometheus",
-        "url": "http://localhost:9091",
+        "url": "http://127.0.0.1:9091",
         "access": "proxy",
         "isDefault": True,
         "basicAuth": False
     }
     
     try:
-        # Check if datasource already exists
-        response = requests.get("http://localhost:3001/api/datasources", 
-                              auth=("admin", "admin123"), timeout=10)
+        # Check if datasource already exists (single lookup, no list scan)
+        response = SESSION.get("http://127.0.0.1:3001/api/datasources/name/Prometheus",
+                             timeout=PROBE_TIMEOUT)
         
         if response.status_code == 200:
-            existing_ds = [ds for ds in response.json() if ds['name'] == 'Prometheus']
-            if existing_ds:
-                print("✅ Prometheus datasource already exists")
-                return True
+            print("✅ Prometheus datasource already exists")
+            return True
+        elif response.status_code != 404:
+            print(f"❌ Failed to look up datasource: {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
         
         # Create datasource
-        response = requests.post("http://localhost:3001/api/datasources",
-                               json=datasource_config,
-                               auth=("admin", "admin123"),
-                               headers={"Content-Type": "application/json"},
-                               timeout=10)
+        response = SESSION.post("http://127.0.0.1:3001/api/datasources",
+                              json=datasource_config,
+                              timeout=API_TIMEOUT)
         
         if response.status_code in [200, 409]:  # 409 = already exists
             print("✅ Prometheus datasource configured")
@@ -68,113 +93,21 @@ def setup_datasource():
         print(f"❌ Error setting up datasource: {e}")
         return False
 
+# Dashboard payload, serialized once at import time
+try:
+    import orjson
+    _DASHBOARD_BODY = orjson.dumps(SIMPLE_DASHBOARD)
+except ImportError:
+    _DASHBOARD_BODY = json.dumps(SIMPLE_DASHBOARD).encode()
+
 def create_simple_dashboard():
     """Create a simple dashboard"""
     print("📊 Creating simple dashboard...")
     
-    dashboard = {
-        "dashboard": {
-            "id": None,
-            "title": "Chaos World - Simple Overview",
-            "tags": ["chaos-world"],
-            "timezone": "browser",
-            "panels": [
-                {
-                    "id": 1,
-                    "title": "Service Status",
-                    "type": "stat",
-                    "targets": [
-                        {
-                            "expr": "up{job=~\"chaos-world-.*\"}",
-                            "legendFormat": "{{job}}"
-                        }
-                    ],
-                    "fieldConfig": {
-                        "defaults": {
-                            "color": {
-                                "mode": "thresholds"
-                            },
-                            "thresholds": {
-                                "steps": [
-                                    {"color": "red", "value": 0},
-                                    {"color": "green", "value": 1}
-                                ]
-                            },
-                            "mappings": [
-                                {"type": "value", "value": "0", "text": "DOWN"},
-                                {"type": "value", "value": "1", "text": "UP"}
-                            ]
-                        }
-                    },
-                    "gridPos": {"h": 8, "w": 12, "x": 0, "y": 0}
-                },
-                {
-                    "id": 2,
-                    "title": "Request Rate",
-                    "type": "graph",
-                    "targets": [
-                        {
-                            "expr": "rate(cms_request_duration_seconds_count[5m])",
-                            "legendFormat": "CMS Requests/sec"
-                        },
-                        {
-                            "expr": "rate(user_management_request_duration_seconds_count[5m])",
-                            "legendFormat": "User Management Requests/sec"
-                        }
-                    ],
-                    "gridPos": {"h": 8, "w": 12, "x": 12, "y": 0}
-                },
-                {
-                    "id": 3,
-                    "title": "Response Time",
-                    "type": "graph",
-                    "targets": [
-                        {
-                            "expr": "histogram_quantile(0.95, rate(cms_request_duration_seconds_bucket[5m]))",
-                            "legendFormat": "95th percentile"
-                        },
-                        {
-                            "expr": "histogram_quantile(0.50, rate(cms_request_duration_seconds_bucket[5m]))",
-                            "legendFormat": "50th percentile"
-                        }
-                    ],
-                    "gridPos": {"h": 8, "w": 24, "x": 0, "y": 8}
-                },
-                {
-                    "id": 4,
-                    "title": "User Management Metrics",
-                    "type": "graph",
-                    "targets": [
-                        {
-                            "expr": "rate(user_management_http_requests_total[5m])",
-                            "legendFormat": "User Management HTTP Requests/sec"
-                        },
-                        {
-                            "expr": "rate(user_management_auth_attempts_total[5m])",
-                            "legendFormat": "Authentication Attempts/sec"
-                        },
-                        {
-                            "expr": "rate(user_management_registrations_total[5m])",
-                            "legendFormat": "User Registrations/sec"
-                        }
-                    ],
-                    "gridPos": {"h": 8, "w": 24, "x": 0, "y": 16}
-                }
-            ],
-            "time": {
-                "from": "now-1h",
-                "to": "now"
-            },
-            "refresh": "5s"
-        }
-    }
-    
     try:
-        response = requests.post("http://localhost:3001/api/dashboards/db",
-                               json=dashboard,
-                               auth=("admin", "admin123"),
-                               headers={"Content-Type": "application/json"},
-                               timeout=10)
+        response = SESSION.post("http://127.0.0.1:3001/api/dashboards/db",
+                              data=_DASHBOARD_BODY,
+                              timeout=API_TIMEOUT)
         
         if response.status_code in [200, 201]:
             print("✅ Simple dashboard created")
@@ -193,14 +126,8 @@ def test_grafana_access():
     print("🔍 Testing Grafana access...")
     
     try:
-        # Test basic access
-        response = requests.get("http://localhost:3001", timeout=10)
-        if response.status_code != 200:
-            print(f"❌ Grafana not accessible: {response.status_code}")
-            return False
-        
-        # Test API access
-        response = requests.get("http://localhost:3001/api/health", timeout=10)
+        # /api/health answering implies the HTTP server is up as well
+        response = SESSION.get("http://127.0.0.1:3001/api/health", timeout=PROBE_TIMEOUT)
         if response.status_code == 200:
             print("✅ Grafana API accessible")
             return True
@@ -225,11 +152,17 @@ def main():
     if not test_grafana_access():
         print("⚠️ Grafana access issues, but continuing...")
     
-    # Setup datasource
-    setup_datasource()
+    # Datasource and dashboard are independent, so push both at once over
+    # the pooled session instead of one after the other
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        datasource = executor.submit(setup_datasource)
+        dashboard = executor.submit(create_simple_dashboard)
+        # Both return False on failure; read both so neither error is dropped
+        results = [datasource.result(), dashboard.result()]
     
-    # Create dashboard
-    create_simple_dashboard()
+    if not all(results):
+        print("\n❌ Manual setup failed")
+        return False
     
     print("\n🎉 Manual setup completed!")
     print("📈 Open Grafana: http://localhost:3001")
@@ -239,4 +172,4 @@ def main():
     return True
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
@@ -6,92 +6,303 @@ Configures and starts Grafana and Prometheus for Chaos World monitoring
 
 import os
 import sys
+import socket
 import subprocess
-import shutil
+import hashlib
 from pathlib import Path
 import json
 import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from monitoring_config import (
+    SIMPLE_DASHBOARD, DATASOURCE_PROVISIONING_FILE, DASHBOARD_PROVISIONING_FILE,
+    datasource_provisioning, dashboard_provisioning, write_if_changed,
+)
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED
+
+# (connect, read) timeouts: short for readiness probes, long for API writes
+PROBE_TIMEOUT = (2, 5)
+API_TIMEOUT = (5, 30)
+
+# Let the servers outlive this script without attaching to its console
+DETACHED_FLAGS = (subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS) if os.name == 'nt' else 0
+
+def _port_in_use(port):
+    """Check whether something is already listening on a local port"""
+    with socket.socket() as s:
+        return s.connect_ex(("127.0.0.1", port)) == 0
+
+# prometheus.yml never changes shape, so it is rendered from a template
+# instead of being built as a dict and serialized with PyYAML
+JOB_TEMPLATE = """\
+  - job_name: {name}
+    static_configs:
+      - targets: ['localhost:{port}']
+    metrics_path: /metrics
+    scrape_interval: 5s
+"""
+
+PROM_YAML_TEMPLATE = """\
+global:
+  scrape_interval: 15s
+  evaluation_interval: 15s
+rule_files: []
+scrape_configs:
+{jobs}"""
+
+# Native restart script so later boots do not need Python at all
+BOOT_SCRIPT_TEMPLATE = """\
+# Generated by setup_monitoring.py - rerun it to regenerate after config changes
+$ErrorActionPreference = "Stop"
+
+function Wait-Http($url, $seconds) {{
+    $deadline = (Get-Date).AddSeconds($seconds)
+    while ((Get-Date) -lt $deadline) {{
+        try {{
+            Invoke-WebRequest -Uri $url -UseBasicParsing -TimeoutSec 5 | Out-Null
+            return $true
+        }} catch {{
+            Start-Sleep -Milliseconds 200
+        }}
+    }}
+    return $false
+}}
+
+Get-Process prometheus, grafana-server -ErrorAction SilentlyContinue | Stop-Process -Force
+
+Start-Process -FilePath "{prometheus_exe}" -WindowStyle Hidden `
+    -RedirectStandardError "{prometheus_log}" `
+    -ArgumentList '--config.file="{prometheus_config}"', '--web.listen-address=0.0.0.0:{prometheus_port}', '--storage.tsdb.path="{prometheus_data}"', '--web.enable-lifecycle'
+
+Start-Process -FilePath "{grafana_exe}" -WindowStyle Hidden `
+    -RedirectStandardOutput "{grafana_log}" `
+    -ArgumentList '--config="{grafana_config}"', '--homepath="{grafana_home}"'
+
+if (-not (Wait-Http "http://127.0.0.1:{prometheus_port}" 30)) {{ Write-Error "Prometheus did not start" }}
+if (-not (Wait-Http "http://127.0.0.1:{grafana_port}/api/health" 60)) {{ Write-Error "Grafana did not start" }}
+Write-Output "Prometheus: http://localhost:{prometheus_port}"
+Write-Output "Grafana: http://localhost:{grafana_port}"
+"""
+
+# Overrides appended to Grafana's defaults.ini
+GRAFANA_INI_TEMPLATE = """
+[server]
+http_port = {port}
+
+[paths]
+data = {data_dir}
+logs = {logs_dir}
+provisioning = {provisioning_dir}
+
+[security]
+admin_user = admin
+admin_password = admin123
+
+[log]
+level = info
+"""
 
 class MonitoringSetup:
+    # (job name, port) of every service Prometheus scrapes
+    SCRAPE_JOBS = (
+        ("chaos-world-api-gateway", 8080),
+        ("chaos-world-backend", 8081),
+        ("chaos-world-user-management", 8082),
+        ("chaos-world-cms", 9090),  # CMS metrics server
+    )
+    
     def __init__(self):
         self.grafana_path = r"C:\ProgramData\chocolatey\lib\grafana\tools\grafana-11.5.8"
         self.prometheus_path = r"C:\ProgramData\chocolatey\lib\prometheus\tools\prometheus-2.2.1.windows-amd64"
         self.config_dir = Path("C:/ChaosWorld/monitoring")
         self.prometheus_port = 9091  # Avoid conflict with CMS metrics on 9090
         self.grafana_port = 3001     # Use port 3001 to avoid conflicts
+        self._grafana_ini_section = GRAFANA_INI_TEMPLATE.format(
+            port=self.grafana_port,
+            data_dir=self.config_dir / 'grafana' / 'data',
+            logs_dir=self.config_dir / 'grafana' / 'logs',
+            provisioning_dir=self.config_dir / 'grafana' / 'provisioning',
+        ).encode()
+        # Server output goes to files so a chatty child never blocks on a full pipe
+        self.prometheus_log = self.config_dir / "prometheus" / "prometheus.log"
+        self.grafana_log = self.config_dir / "grafana" / "logs" / "stdout.log"
+        # Every directory the setup writes into, created once up front
+        self._dirs = (
+            self.config_dir,
+            self.config_dir / "prometheus",
+            self.config_dir / "grafana",
+            self.config_dir / "grafana" / "data",
+            self.config_dir / "grafana" / "logs",
+            self.config_dir / "grafana" / "dashboards",
+            self.config_dir / "grafana" / "provisioning" / "datasources",
+            self.config_dir / "grafana" / "provisioning" / "dashboards",
+        )
+        # Pooled session for the Prometheus/Grafana API calls; retries cover
+        # 502/503 while Grafana is still starting
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST"]),
+            ),
+        ))
+        # Readiness probes have their own poll loops, so they must not retry:
+        # retrying a closed port would stall the loop past its deadline
+        self.probe_session = requests.Session()
+        self.probe_session.mount("http://", HTTPAdapter(pool_maxsize=2, max_retries=0))
+        
+    def _wait_http(self, url, timeout=30, process=None):
+        """Poll url with exponential backoff until it answers 200.
         
+        Gives up early if the given process has already exited.
+        """
+        delay = 0.1
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                return False
+            try:
+                if self.probe_session.get(url, timeout=PROBE_TIMEOUT).status_code == 200:
+                    return True
+            except requests.RequestException:
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+        return False
+    
+    def _wait_for_log(self, log_path, marker, timeout=30, process=None):
+        """Follow a server's log file until the ready marker shows up.
+        
+        Gives up early if the given process has already exited.
+        """
+        deadline = time.monotonic() + timeout
+        tail = b""
+        with open(log_path, "rb") as log:
+            while time.monotonic() < deadline:
+                chunk = log.read()
+                if chunk:
+                    # Keep a little of the previous read so a split marker still matches
+                    buffer = tail + chunk
+                    if marker in buffer:
+                        return True
+                    tail = buffer[-len(marker):]
+                elif process is not None and process.poll() is not None:
+                    return False
+                else:
+                    time.sleep(0.05)
+        return False
+    
+    def _log_tail(self, log_path, size=4096):
+        """Return the last few KB of a log file for diagnostics"""
+        with open(log_path, "rb") as log:
+            log.seek(0, os.SEEK_END)
+            log.seek(max(0, log.tell() - size))
+            return log.read().decode(errors="replace")
+    
+    def create_grafana_provisioning(self):
+        """Write the Prometheus datasource and dashboard provisioning files"""
+        grafana_dir = self.config_dir / "grafana"
+        provisioning_dir = grafana_dir / "provisioning"
+        
+        # Grafana loads these at boot, so no API calls are needed after startup
+        write_if_changed(
+            provisioning_dir / DATASOURCE_PROVISIONING_FILE,
+            datasource_provisioning(f"http://localhost:{self.prometheus_port}")
+        )
+        write_if_changed(
+            provisioning_dir / DASHBOARD_PROVISIONING_FILE,
+            dashboard_provisioning(grafana_dir / "dashboards")
+        )
+        # Earlier runs wrote these under other names; left behind they would
+        # provision a second default datasource and a duplicate provider
+        for stale in ("datasources/prometheus.yaml", "dashboards/chaos-world.yaml"):
+            (provisioning_dir / stale).unlink(missing_ok=True)
+        write_if_changed(
+            grafana_dir / "dashboards" / "chaos-world-simple.json",
+            json.dumps(SIMPLE_DASHBOARD["dashboard"], indent=2).encode()
+        )
+        print(f"✅ Grafana provisioning created: {provisioning_dir}")
+    
+    def _emit_boot_script(self):
+        """Write start_monitoring-<hash>.ps1 for restarting the stack natively.
+        
+        The suffix is a hash of the ports, paths and scrape jobs, so the script
+        is only regenerated when the configuration drifts.
+        """
+        script = BOOT_SCRIPT_TEMPLATE.format(
+            prometheus_exe=Path(self.prometheus_path) / "prometheus.exe",
+            prometheus_config=self.config_dir / "prometheus" / "prometheus.yml",
+            prometheus_data=self.config_dir / "prometheus" / "data",
+            prometheus_log=self.prometheus_log,
+            prometheus_port=self.prometheus_port,
+            grafana_exe=Path(self.grafana_path) / "bin" / "grafana-server.exe",
+            grafana_config=self.config_dir / "grafana" / "grafana.ini",
+            grafana_home=self.grafana_path,
+            grafana_log=self.grafana_log,
+            grafana_port=self.grafana_port,
+        )
+        digest = hashlib.sha256((script + repr(self.SCRAPE_JOBS)).encode()).hexdigest()[:12]
+        script_file = self.config_dir / f"start_monitoring-{digest}.ps1"
+        
+        if not script_file.exists():
+            # Drop scripts generated for an older configuration
+            for stale in self.config_dir.glob("start_monitoring-*.ps1"):
+                stale.unlink()
+            script_file.write_text(script, encoding="utf-8")
+        
+        print(f"✅ Boot script ready: {script_file}")
+        return script_file
+    
+    def _stop_existing(self, image_name, port):
+        """Kill a previous server instance, but only if its port is occupied"""
+        if not _port_in_use(port):
+            return
+        try:
+            subprocess.run(["taskkill", "/F", "/IM", image_name], 
+                         capture_output=True, check=False, timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        # Wait (at most 3s) for the port to be released
+        deadline = time.monotonic() + 3
+        while _port_in_use(port) and time.monotonic() < deadline:
+            time.sleep(0.1)
+    
     def create_directories(self):
         """Create monitoring configuration directories"""
         print("📁 Creating monitoring directories...")
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-        (self.config_dir / "prometheus").mkdir(exist_ok=True)
-        (self.config_dir / "grafana").mkdir(exist_ok=True)
+        for directory in self._dirs:
+            directory.mkdir(parents=True, exist_ok=True)
         print(f"✅ Directories created: {self.config_dir}")
     
     def create_prometheus_config(self):
-        """Create Prometheus configuration"""
+        """Create Prometheus configuration, returning whether the file changed"""
         print("⚙️ Creating Prometheus configuration...")
         
-        config = {
-            "global": {
-                "scrape_interval": "15s",
-                "evaluation_interval": "15s"
-            },
-            "rule_files": [],
-            "scrape_configs": [
-                {
-                    "job_name": "chaos-world-api-gateway",
-                    "static_configs": [
-                        {
-                            "targets": ["localhost:8080"]
-                        }
-                    ],
-                    "metrics_path": "/metrics",
-                    "scrape_interval": "5s"
-                },
-                {
-                    "job_name": "chaos-world-backend",
-                    "static_configs": [
-                        {
-                            "targets": ["localhost:8081"]
-                        }
-                    ],
-                    "metrics_path": "/metrics",
-                    "scrape_interval": "5s"
-                },
-                {
-                    "job_name": "chaos-world-user-management",
-                    "static_configs": [
-                        {
-                            "targets": ["localhost:8082"]
-                        }
-                    ],
-                    "metrics_path": "/metrics",
-                    "scrape_interval": "5s"
-                },
-                {
-                    "job_name": "chaos-world-cms",
-                    "static_configs": [
-                        {
-                            "targets": ["localhost:9090"]  # CMS metrics server
-                        }
-                    ],
-                    "metrics_path": "/metrics",
-                    "scrape_interval": "5s"
-                }
-            ]
-        }
+        jobs = "".join(JOB_TEMPLATE.format(name=name, port=port) for name, port in self.SCRAPE_JOBS)
         
         config_file = self.config_dir / "prometheus" / "prometheus.yml"
-        with open(config_file, 'w') as f:
-            import yaml
-            yaml.dump(config, f, default_flow_style=False)
+        # Leave an identical file (and its mtime) alone
+        if not write_if_changed(config_file, PROM_YAML_TEMPLATE.format(jobs=jobs).encode()):
+            print(f"✅ Prometheus config unchanged: {config_file}")
+            return False
         
         print(f"✅ Prometheus config created: {config_file}")
-        return config_file
+        return True
     
-    def start_prometheus(self):
-        """Start Prometheus on port 9091"""
+    def reload_prometheus(self):
+        """Ask the running Prometheus to reload its config via the lifecycle API"""
+        try:
+            response = self.session.post(f"http://127.0.0.1:{self.prometheus_port}/-/reload", timeout=PROBE_TIMEOUT)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+    
+    def launch_prometheus(self):
+        """Launch Prometheus on port 9091 without waiting for it to be ready"""
         print("🚀 Starting Prometheus...")
         
         config_file = self.config_dir / "prometheus" / "prometheus.yml"
@@ -99,15 +310,10 @@ class MonitoringSetup:
         
         if not prometheus_exe.exists():
             print(f"❌ Prometheus executable not found: {prometheus_exe}")
-            return False
+            return None
         
         # Kill existing Prometheus if running
-        try:
-            subprocess.run(["taskkill", "/F", "/IM", "prometheus.exe"], 
-                         capture_output=True, check=False)
-            time.sleep(2)
-        except:
-            pass
+        self._stop_existing("prometheus.exe", self.prometheus_port)
         
         # Start Prometheus
         cmd = [
@@ -119,26 +325,34 @@ class MonitoringSetup:
         ]
         
         try:
-            subprocess.Popen(cmd, 
-                           stdout=subprocess.DEVNULL, 
-                           stderr=subprocess.DEVNULL)
-            time.sleep(3)
-            
-            # Test if Prometheus is running
-            import requests
-            response = requests.get(f"http://localhost:{self.prometheus_port}", timeout=5)
-            if response.status_code == 200:
-                print(f"✅ Prometheus started on port {self.prometheus_port}")
-                return True
-            else:
-                print(f"❌ Prometheus failed to start")
-                return False
+            with open(self.prometheus_log, "wb") as log_fh:
+                return subprocess.Popen(cmd, 
+                                      stdout=log_fh, 
+                                      stderr=subprocess.STDOUT,
+                                      creationflags=DETACHED_FLAGS)
         except Exception as e:
             print(f"❌ Error starting Prometheus: {e}")
+            return None
+    
+    def wait_prometheus(self, process):
+        """Wait for a launched Prometheus to answer HTTP requests"""
+        self._wait_for_log(self.prometheus_log, b"Server is ready to receive web requests", process=process)
+        
+        # Test if Prometheus is running
+        if self._wait_http(f"http://127.0.0.1:{self.prometheus_port}", timeout=5, process=process):
+            print(f"✅ Prometheus started on port {self.prometheus_port}")
+            return True
+        else:
+            print(f"❌ Prometheus failed to start")
             return False
     
-    def start_grafana(self):
-        """Start Grafana on port 3001"""
+    def start_prometheus(self):
+        """Start Prometheus on port 9091"""
+        process = self.launch_prometheus()
+        return process is not None and self.wait_prometheus(process)
+    
+    def launch_grafana(self):
+        """Launch Grafana on port 3001 without waiting for it to be ready"""
         print(f"🚀 Starting Grafana on port {self.grafana_port}...")
         
         grafana_exe = Path(self.grafana_path) / "bin" / "grafana-server.exe"
@@ -146,51 +360,23 @@ class MonitoringSetup:
         
         if not grafana_exe.exists():
             print(f"❌ Grafana executable not found: {grafana_exe}")
-            return False
+            return None
         
         print(f"📁 Grafana executable: {grafana_exe}")
         print(f"📁 Config file: {config_file}")
         
         # Kill existing Grafana if running
-        try:
-            print("🔄 Stopping existing Grafana processes...")
-            subprocess.run(["taskkill", "/F", "/IM", "grafana-server.exe"], 
-                         capture_output=True, check=False)
-            time.sleep(3)
-        except:
-            pass
+        print("🔄 Stopping existing Grafana processes...")
+        self._stop_existing("grafana-server.exe", self.grafana_port)
         
         # Create a custom Grafana config file with the correct port
         custom_config = self.config_dir / "grafana" / "grafana.ini"
-        custom_config.parent.mkdir(parents=True, exist_ok=True)
         
-        # Ensure data and logs directories exist
-        (self.config_dir / "grafana" / "data").mkdir(parents=True, exist_ok=True)
-        (self.config_dir / "grafana" / "logs").mkdir(parents=True, exist_ok=True)
+        # Default config plus port and security overrides; only rewrite on change
+        write_if_changed(custom_config, config_file.read_bytes() + self._grafana_ini_section)
         
-        # Read the default config and modify it
-        with open(config_file, 'r') as f:
-            config_content = f.read()
-        
-        # Add port and security configuration
-        config_content += f"""
-[server]
-http_port = {self.grafana_port}
-
-[paths]
-data = {self.config_dir / 'grafana' / 'data'}
-logs = {self.config_dir / 'grafana' / 'logs'}
-
-[security]
-admin_user = admin
-admin_password = admin123
-
-[log]
-level = info
-"""
-        
-        with open(custom_config, 'w') as f:
-            f.write(config_content)
+        # Datasource and dashboard are provisioned from files at boot
+        self.create_grafana_provisioning()
         
         # Start Grafana with the custom config
         cmd = [
@@ -203,61 +389,98 @@ level = info
         
         try:
             # Start Grafana in background
-            process = subprocess.Popen(cmd, 
-                                     stdout=subprocess.PIPE, 
-                                     stderr=subprocess.PIPE,
-                                     text=True)
-            
-            # Wait a bit for startup
-            print("⏳ Waiting for Grafana to start...")
-            time.sleep(10)
-            
-            # Check if process is still running
-            if process.poll() is not None:
-                stdout, stderr = process.communicate()
-                print(f"❌ Grafana process exited early")
-                print(f"STDOUT: {stdout}")
-                print(f"STDERR: {stderr}")
-                return False
-            
-            # Test if Grafana is running
-            print(f"🔍 Testing Grafana on http://localhost:{self.grafana_port}")
-            import requests
-            response = requests.get(f"http://localhost:{self.grafana_port}", timeout=15)
-            if response.status_code == 200:
-                print(f"✅ Grafana started successfully on port {self.grafana_port}")
-                return True
-            else:
-                print(f"❌ Grafana responded with status {response.status_code}")
-                return False
+            with open(self.grafana_log, "wb") as log_fh:
+                return subprocess.Popen(cmd, 
+                                      stdout=log_fh, 
+                                      stderr=subprocess.STDOUT,
+                                      creationflags=DETACHED_FLAGS)
         except Exception as e:
             print(f"❌ Error starting Grafana: {e}")
+            return None
+    
+    def wait_grafana(self, process):
+        """Wait for a launched Grafana to answer HTTP requests"""
+        # Wait for startup
+        print("⏳ Waiting for Grafana to start...")
+        self._wait_for_log(self.grafana_log, b"HTTP Server Listen", timeout=60, process=process)
+        ready = self._wait_http(f"http://127.0.0.1:{self.grafana_port}/api/health", timeout=5, process=process)
+        
+        # Check if process is still running
+        if process.poll() is not None:
+            print(f"❌ Grafana process exited early")
+            print(f"LOG ({self.grafana_log}):")
+            print(self._log_tail(self.grafana_log))
+            return False
+        
+        # Test if Grafana is running
+        print(f"🔍 Testing Grafana on http://localhost:{self.grafana_port}")
+        if ready:
+            print(f"✅ Grafana started successfully on port {self.grafana_port}")
+            return True
+        else:
+            print(f"❌ Grafana did not become ready on port {self.grafana_port}")
+            return False
+    
+    def start_grafana(self):
+        """Start Grafana on port 3001"""
+        process = self.launch_grafana()
+        return process is not None and self.wait_grafana(process)
+    
+    def _wait_healthy(self, deadline=30):
+        """Poll Grafana's /api/health with backoff until its database is ok"""
+        delay = 0.1
+        end = time.monotonic() + deadline
+        while time.monotonic() < end:
+            try:
+                response = self.probe_session.get(f"http://127.0.0.1:{self.grafana_port}/api/health", timeout=PROBE_TIMEOUT)
+                if response.ok and response.json().get("database") == "ok":
+                    return True
+            except (requests.RequestException, ValueError):
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+        return False
+    
+    def datasource_exists(self):
+        """Check whether Grafana already has the Prometheus datasource"""
+        try:
+            response = self.session.get(
+                f"http://127.0.0.1:{self.grafana_port}/api/datasources/name/Prometheus",
+                auth=("admin", "admin123"),
+                timeout=PROBE_TIMEOUT
+            )
+            return response.status_code == 200
+        except requests.RequestException:
             return False
     
     def setup_grafana_datasource(self):
-        """Configure Grafana to use Prometheus as datasource"""
+        """Configure Grafana to use Prometheus as datasource via the API.
+        
+        Normally the datasource is provisioned from file at boot; this is the
+        fallback for Grafana installs that ignore the provisioning directory.
+        """
         print("🔗 Setting up Grafana datasource...")
         
-        # Wait for Grafana to be ready
-        time.sleep(10)
+        # Wait for Grafana's API to be ready
+        if not self._wait_healthy():
+            print("⚠️ Grafana API did not become healthy")
+            return False
         
         datasource_config = {
             "name": "Prometheus",
             "type": "prometheus",
-            "url": f"http://localhost:{self.prometheus_port}",
+            "url": f"http://127.0.0.1:{self.prometheus_port}",
             "access": "proxy",
             "isDefault": True
         }
         
         try:
-            import requests
-            
             # Create datasource (Grafana runs on port 3001)
-            response = requests.post(
-                "http://localhost:3001/api/datasources",
+            response = self.session.post(
+                "http://127.0.0.1:3001/api/datasources",
                 json=datasource_config,
-                headers={"Content-Type": "application/json"},
-                auth=("admin", "admin123")
+                auth=("admin", "admin123"),
+                timeout=API_TIMEOUT
             )
             
             if response.status_code in [200, 409]:  # 409 = already exists
@@ -279,25 +502,51 @@ level = info
         self.create_directories()
         
         # Create Prometheus config
-        self.create_prometheus_config()
+        prometheus_changed = self.create_prometheus_config()
         
-        # Start services
-        if not self.start_prometheus():
+        # Keep a running Prometheus: unchanged config needs nothing, a changed
+        # one is hot-reloaded (--web.enable-lifecycle is set)
+        prometheus = None
+        if _port_in_use(self.prometheus_port) and (not prometheus_changed or self.reload_prometheus()):
+            print(f"✅ Prometheus already running on port {self.prometheus_port}")
+        else:
+            prometheus = self.launch_prometheus()
+            if prometheus is None:
+                print("❌ Failed to start Prometheus")
+                return False
+        
+        # Start Grafana, then wait for both to come up concurrently
+        grafana = self.launch_grafana()
+        if grafana is None:
+            print("❌ Failed to start Grafana")
+            return False
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            prometheus_ready = executor.submit(lambda: prometheus is None or self.wait_prometheus(prometheus))
+            grafana_ready = executor.submit(self.wait_grafana, grafana)
+            wait([prometheus_ready, grafana_ready], return_when=ALL_COMPLETED)
+        
+        if not prometheus_ready.result():
             print("❌ Failed to start Prometheus")
             return False
         
-        if not self.start_grafana():
+        if not grafana_ready.result():
             print("❌ Failed to start Grafana")
             return False
         
-        # Setup datasource
-        self.setup_grafana_datasource()
+        # Datasource is provisioned at boot; fall back to the API if it is missing
+        if not self.datasource_exists():
+            self.setup_grafana_datasource()
+        
+        # Later restarts can skip Python and run the generated script directly
+        boot_script = self._emit_boot_script()
         
         print("\n🎉 Monitoring setup completed!")
         print(f"📊 Prometheus: http://localhost:{self.prometheus_port}")
         print(f"📈 Grafana: http://localhost:{self.grafana_port}")
         print("🔑 Grafana login: admin / admin")
         print(f"📊 CMS Metrics: http://localhost:9090 (your existing service)")
+        print(f"🔁 Restart later with: powershell -ExecutionPolicy Bypass -File {boot_script}")
         
         return True
 
@@ -6,9 +6,16 @@ A Python script to start all Chaos World services
 
 import os
 import sys
+from pathlib import Path
 import subprocess
 import time
 import requests
+from requests.adapters import HTTPAdapter
+
+# Share the queued console logger and Windows helpers with the other scripts
+sys.path.insert(0, str(Path(__file__).parent))
+from console_log import log_message
+from windows_utils import is_admin
 
 class ServiceManager:
     def __init__(self):
@@ -24,35 +31,41 @@ class ServiceManager:
             "ChaosWorld-CMS": "http://localhost:8083",
             "ChaosWorld-UserManagement": "http://localhost:8082"
         }
+        # Keep-alive connections to each service port survive across health polls
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
     
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
-        import time
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] {level}: {message}")
-    
-    def check_admin(self) -> bool:
-        """Check if running as administrator"""
-        try:
-            import ctypes
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
-            return False
+        log_message(message, level)
     
     def start_service(self, service_name: str) -> bool:
         """Start a single service"""
-        try:
-            result = subprocess.run(
+        return self.start_services([service_name]) == 1
+    
+    def start_services(self, service_names) -> int:
+        """Start services concurrently, returning how many succeeded"""
+        # Spawn every `sc start` up front so the SCM handles them in parallel
+        processes = [
+            (service_name, subprocess.Popen(
                 ["sc", "start", service_name],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            self.log(f"✅ {service_name} started")
-            return True
-        except subprocess.CalledProcessError as e:
-            self.log(f"❌ Failed to start {service_name}: {e.stderr}", "ERROR")
-            return False
+                # sc reports failures such as "[SC] StartService FAILED 1053" on stdout
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            ))
+            for service_name in service_names
+        ]
+        
+        succeeded = 0
+        for service_name, process in processes:
+            output, _ = process.communicate()
+            if process.returncode == 0:
+                self.log(f"✅ {service_name} started")
+                succeeded += 1
+            else:
+                # Only decode the tail of the output, and only when it is needed
+                self.log(f"❌ Failed to start {service_name}: {output[-2048:].decode(errors='replace').strip()}", "ERROR")
+        return succeeded
     
     def check_service_health(self, service_name: str) -> bool:
         """Check if service is responding"""
@@ -61,34 +74,43 @@ class ServiceManager:
         
         url = self.service_urls[service_name]
         try:
-            response = requests.get(f"{url}/health", timeout=5)
+            response = self.session.get(f"{url}/health", timeout=5)
             return response.status_code == 200
         except:
             return False
     
+    def wait_for_services(self, timeout: float = 15, poll: float = 0.25) -> dict:
+        """Poll /health with exponential backoff until every service answers or timeout"""
+        health = {}
+        delay = poll
+        deadline = time.monotonic() + timeout
+        while True:
+            health = {service: health.get(service) or self.check_service_health(service) for service in self.services}
+            if all(health.values()) or time.monotonic() >= deadline:
+                return health
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+    
     def start_all_services(self):
         """Start all Chaos World services"""
         self.log("Starting Chaos World Backend Services...")
         
-        if not self.check_admin():
+        if not is_admin():
             self.log("This script must be run as Administrator!", "ERROR")
             self.log("Right-click and select 'Run as administrator'", "ERROR")
             return False
         
-        success_count = 0
-        for service in self.services:
-            if self.start_service(service):
-                success_count += 1
+        success_count = self.start_services(self.services)
         
         if success_count > 0:
             self.log("", "SUCCESS")
             self.log("Waiting for services to initialize...", "INFO")
-            time.sleep(10)
+            health = self.wait_for_services()
             
             # Check service health
             self.log("Checking service health...", "INFO")
             for service in self.services:
-                if self.check_service_health(service):
+                if health[service]:
                     self.log(f"✅ {service} is healthy")
                 else:
                     self.log(f"⚠️  {service} may not be responding yet", "WARNING")
@@ -6,9 +6,15 @@ A Python script to stop all Chaos World services
 
 import os
 import sys
+from pathlib import Path
 import subprocess
 import time
 
+# Share the queued console logger and Windows helpers with the other scripts
+sys.path.insert(0, str(Path(__file__).parent))
+from console_log import log_message
+from windows_utils import is_admin
+
 class ServiceManager:
     def __init__(self):
         self.services = [
@@ -20,46 +26,46 @@ class ServiceManager:
     
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
-        import time
-        timestamp = time.strftime("%H:%M:%S")
-        print(f"[{timestamp}] {level}: {message}")
-    
-    def check_admin(self) -> bool:
-        """Check if running as administrator"""
-        try:
-            import ctypes
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
-            return False
+        log_message(message, level)
     
     def stop_service(self, service_name: str) -> bool:
         """Stop a single service"""
-        try:
-            result = subprocess.run(
+        return self.stop_services([service_name]) == 1
+    
+    def stop_services(self, service_names) -> int:
+        """Stop services concurrently, returning how many succeeded"""
+        # Spawn every `sc stop` up front so the SCM handles them in parallel
+        processes = [
+            (service_name, subprocess.Popen(
                 ["sc", "stop", service_name],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            self.log(f"✅ {service_name} stopped")
-            return True
-        except subprocess.CalledProcessError as e:
-            self.log(f"❌ Failed to stop {service_name}: {e.stderr}", "ERROR")
-            return False
+                # sc reports failures such as "[SC] StartService FAILED 1053" on stdout
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            ))
+            for service_name in service_names
+        ]
+        
+        succeeded = 0
+        for service_name, process in processes:
+            output, _ = process.communicate()
+            if process.returncode == 0:
+                self.log(f"✅ {service_name} stopped")
+                succeeded += 1
+            else:
+                # Only decode the tail of the output, and only when it is needed
+                self.log(f"❌ Failed to stop {service_name}: {output[-2048:].decode(errors='replace').strip()}", "ERROR")
+        return succeeded
     
     def stop_all_services(self):
         """Stop all Chaos World services"""
         self.log("Stopping Chaos World Backend Services...")
         
-        if not self.check_admin():
+        if not is_admin():
             self.log("This script must be run as Administrator!", "ERROR")
             self.log("Right-click and select 'Run as administrator'", "ERROR")
             return False
         
-        success_count = 0
-        for service in self.services:
-            if self.stop_service(service):
-                success_count += 1
+        success_count = self.stop_services(self.services)
         
         if success_count > 0:
             self.log("", "SUCCESS")
@@ -30,13 +30,14 @@ def test_build_integration():
     
     all_found = True
     for exe in executables:
-        exe_path = target_dir / exe
-        if exe_path.exists():
-            size = exe_path.stat().st_size
-            print(f"✅ {exe} found ({size:,} bytes)")
-        else:
+        # One stat() both checks existence and yields the size
+        try:
+            size = (target_dir / exe).stat().st_size
+        except FileNotFoundError:
             print(f"❌ {exe} not found")
             all_found = False
+            continue
+        print(f"✅ {exe} found ({size:,} bytes)")
     
     if all_found:
         print("\n🎉 All executables found! Build integration is working correctly.")
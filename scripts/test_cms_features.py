@@ -5,15 +5,50 @@ Comprehensive testing of all CMS service endpoints
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
+# orjson parses straight from bytes in C; fall back to the stdlib when absent
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+METRICS_URL = "http://localhost:9090/metrics"
+
 class CMSTester:
+    # Read-only endpoints that need no token, so they can be fetched concurrently up front
+    PUBLIC_ENDPOINTS = ("/", "/health", "/api/v1/health", "/api/v1/metrics/info")
+    
     def __init__(self, base_url: str = "http://localhost:8083"):
         self.base_url = base_url
         self.session = requests.Session()
+        # Room for the concurrent prefetch without dropping pooled connections
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=16))
         self.token = None
+        self._prefetched = {}
+        self._metrics_future = None
+    
+    def prefetch_public_endpoints(self):
+        """Fetch the public endpoints and the metrics server concurrently.
+        
+        Results are replayed in order by the test_* methods, so the output
+        is the same as fetching them one by one.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.PUBLIC_ENDPOINTS) + 1) as executor:
+            self._metrics_future = executor.submit(self.session.get, METRICS_URL, timeout=10)
+            results = executor.map(lambda endpoint: self.test_endpoint("GET", endpoint), self.PUBLIC_ENDPOINTS)
+            self._prefetched = dict(zip(self.PUBLIC_ENDPOINTS, results))
+    
+    def get_public(self, endpoint: str) -> Dict[str, Any]:
+        """GET a public endpoint, using the prefetched result when there is one"""
+        if endpoint in self._prefetched:
+            return self._prefetched.pop(endpoint)
+        return self.test_endpoint("GET", endpoint)
     
     def test_endpoint(self, method: str, endpoint: str, data: Dict = None, headers: Dict = None, expected_status: int = 200) -> Dict[str, Any]:
         """Test a single endpoint"""
@@ -32,7 +67,7 @@ class CMSTester:
                 "method": method,
                 "status_code": response.status_code,
                 "success": response.status_code == expected_status,
-                "response": response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text
+                "response": _json_loads(response.content) if response.headers.get('content-type', '').startswith('application/json') else response.text
             }
             
             return result
@@ -52,13 +87,13 @@ class CMSTester:
         print("-" * 40)
         
         # Test root endpoint
-        result = self.test_endpoint("GET", "/")
+        result = self.get_public("/")
         print(f"GET / - Status: {result['status_code']} - {'✅' if result['success'] else '❌'}")
         if result['success']:
             print(f"  Response: {result['response']['data']}")
         
         # Test health endpoint
-        result = self.test_endpoint("GET", "/health")
+        result = self.get_public("/health")
         print(f"GET /health - Status: {result['status_code']} - {'✅' if result['success'] else '❌'}")
         if result['success']:
             print(f"  Response: {result['response']['data']}")
@@ -77,6 +112,8 @@ class CMSTester:
         
         if result['success'] and 'data' in result['response']:
             self.token = result['response']['data']['token']
+            # Every later request on the session carries the token
+            self.session.headers["Authorization"] = f"Bearer {self.token}"
             print(f"  Token received: {self.token[:50]}...")
             print(f"  Expires in: {result['response']['data']['expires_in']} seconds")
         else:
@@ -84,8 +121,7 @@ class CMSTester:
         
         # Test me endpoint
         if self.token:
-            headers = {"Authorization": f"Bearer {self.token}"}
-            result = self.test_endpoint("GET", "/api/v1/auth/me", headers=headers)
+            result = self.test_endpoint("GET", "/api/v1/auth/me")
             print(f"GET /api/v1/auth/me - Status: {result['status_code']} - {'✅' if result['success'] else '❌'}")
             if result['success']:
                 print(f"  User: {result['response']['data']['username']} ({result['response']['data']['role']})")
@@ -98,13 +134,13 @@ class CMSTester:
         print("-" * 40)
         
         # Test health endpoint (monitoring)
-        result = self.test_endpoint("GET", "/api/v1/health")
+        result = self.get_public("/api/v1/health")
         print(f"GET /api/v1/health - Status: {result['status_code']} - {'✅' if result['success'] else '❌'}")
         if result['success']:
             print(f"  Response: {result['response']}")
         
         # Test metrics info endpoint
-        result = self.test_endpoint("GET", "/api/v1/metrics/info")
+        result = self.get_public("/api/v1/metrics/info")
         print(f"GET /api/v1/metrics/info - Status: {result['status_code']} - {'✅' if result['success'] else '❌'}")
         if result['success']:
             print(f"  Response: {result['response']}")
@@ -120,10 +156,8 @@ class CMSTester:
             print("❌ No token available, skipping protected endpoint tests")
             return
         
-        headers = {"Authorization": f"Bearer {self.token}"}
-        
         # Test admin endpoint
-        result = self.test_endpoint("GET", "/api/v1/admin", headers=headers)
+        result = self.test_endpoint("GET", "/api/v1/admin")
         print(f"GET /api/v1/admin - Status: {result['status_code']} - {'✅' if result['success'] else '❌'}")
         if result['success']:
             print(f"  Response: {result['response']['data']['message']}")
@@ -138,24 +172,35 @@ class CMSTester:
         print("-" * 40)
         
         try:
-            response = requests.get("http://localhost:9090/metrics", timeout=10)
+            future, self._metrics_future = self._metrics_future, None
+            if future is not None:
+                response = future.result()
+            else:
+                response = self.session.get(METRICS_URL, timeout=10)
             if response.status_code == 200:
                 print("✅ Metrics server is responding")
                 metrics_text = response.text
                 
-                # Count different metric types
-                lines = metrics_text.split('\n')
-                help_lines = [line for line in lines if line.startswith('# HELP')]
-                metric_lines = [line for line in lines if not line.startswith('#') and line.strip()]
+                # Count different metric types in a single pass, keeping a few samples
+                help_count = 0
+                metric_count = 0
+                sample = []
+                for line in metrics_text.splitlines():
+                    if line.startswith('#'):
+                        if line.startswith('# HELP'):
+                            help_count += 1
+                    elif line.strip():
+                        metric_count += 1
+                        if len(sample) < 5:
+                            sample.append(line)
                 
-                print(f"  Found {len(help_lines)} metric types")
-                print(f"  Found {len(metric_lines)} metric values")
+                print(f"  Found {help_count} metric types")
+                print(f"  Found {metric_count} metric values")
                 
                 # Show some example metrics
                 print("  Sample metrics:")
-                for line in metric_lines[:5]:
-                    if line.strip():
-                        print(f"    {line}")
+                for line in sample:
+                    print(f"    {line}")
             else:
                 print(f"❌ Metrics server returned status {response.status_code}")
         except Exception as e:
@@ -169,6 +214,9 @@ class CMSTester:
         print("=" * 50)
         print()
         
+        # Independent read-only calls go out together; auth-dependent ones stay sequenced
+        self.prefetch_public_endpoints()
+        
         self.test_health_endpoints()
         self.test_auth_endpoints()
         self.test_monitoring_endpoints()
@@ -6,12 +6,19 @@ Try different common passwords to find the correct one
 
 import requests
 import time
+from requests.adapters import HTTPAdapter
 
-def test_login(username, password):
+# One keep-alive connection reused for every login attempt. Grafana is plain http
+# on localhost, where HTTP/2 is never negotiated (no TLS/ALPN), so a pooled
+# HTTP/1.1 connection is as good as it gets here.
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+def test_login(session, username, password):
     """Test login with given credentials"""
     try:
-        response = requests.get("http://localhost:3001/api/org", 
-                              auth=(username, password), timeout=5)
+        response = session.get("http://localhost:3001/api/org", 
+                               auth=(username, password), timeout=5)
         if response.status_code == 200:
             return True, response.json()
         else:
@@ -37,16 +44,19 @@ def main():
     
     username = "admin"
     
-    for password in passwords_to_try:
-        print(f"🔍 Trying: {username} / {password}")
-        success, result = test_login(username, password)
-        
-        if success:
-            print(f"✅ SUCCESS! Login works with: {username} / {password}")
-            print(f"📊 Org info: {result}")
-            return password
-        else:
-            print(f"❌ Failed: {result}")
+    # Attempts stay sequential: Grafana's login lockout counts failed attempts,
+    # so nothing may be sent after the right password matches
+    with SESSION as session:
+        for password in passwords_to_try:
+            print(f"🔍 Trying: {username} / {password}")
+            success, result = test_login(session, username, password)
+            
+            if success:
+                print(f"✅ SUCCESS! Login works with: {username} / {password}")
+                print(f"📊 Org info: {result}")
+                return password
+            else:
+                print(f"❌ Failed: {result}")
     
     print("\n❌ None of the common passwords worked!")
     print("💡 You may need to:")
@@ -5,9 +5,69 @@ A Python script to uninstall all Chaos World services
 """
 
 import os
+import stat
 import sys
 import subprocess
-import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from windows_utils import NO_WINDOW, is_admin
+
+# Stops and removes every service in one PowerShell process. `sc stop` only
+# sends the stop control, so all services wind down together during the sleep.
+# One RESULT line per service carries nssm's exit code and output back to us.
+UNINSTALL_SCRIPT = """
+$services = @({services})
+foreach ($s in $services) {{ sc.exe stop $s | Out-Null }}
+Start-Sleep -Seconds 3
+foreach ($s in $services) {{
+    $out = & '{nssm}' remove $s confirm 2>&1 | Out-String
+    Write-Output ("RESULT|" + $s + "|" + $LASTEXITCODE + "|" + ($out.Trim() -replace '\s+', ' '))
+}}
+"""
+
+# Reparse tag of a junction (the stat module only defines it on Windows)
+IO_REPARSE_TAG_MOUNT_POINT = getattr(stat, "IO_REPARSE_TAG_MOUNT_POINT", 0xA0000003)
+
+def _is_link(entry: os.DirEntry) -> bool:
+    """Check for a symlink or a Windows junction, neither of which may be walked into"""
+    if entry.is_symlink():
+        return True
+    # is_symlink()/islink() are False for junctions (os.path.isjunction is 3.12+)
+    st = entry.stat(follow_symlinks=False)
+    return bool(getattr(st, "st_file_attributes", 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT
+                and getattr(st, "st_reparse_tag", 0) == IO_REPARSE_TAG_MOUNT_POINT)
+
+def fast_rmtree(root: str, max_workers: int = 8):
+    """Delete a directory tree, unlinking its files on a thread pool"""
+    files = []
+    dirs = []
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
+        dirs.append(dirpath)
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and not _is_link(entry):
+                    stack.append(entry.path)
+                else:
+                    # os.remove drops a symlink or junction without touching its target
+                    files.append(entry.path)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(os.remove, files))
+    
+    # Every directory was listed before its subdirectories, so remove them in reverse
+    for path in reversed(dirs):
+        os.rmdir(path)
+
+@dataclass(frozen=True)
+class Preflight:
+    """Environment facts gathered once before touching any service"""
+    is_admin: bool
+    has_nssm: bool
+    service_dir_exists: bool
+    log_dir_exists: bool
 
 class ServiceManager:
     def __init__(self):
@@ -23,26 +83,30 @@ class ServiceManager:
     
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
-        import time
         timestamp = time.strftime("%H:%M:%S")
         print(f"[{timestamp}] {level}: {message}")
     
+    def _run(self, argv, **kwargs):
+        """Run a console tool without a window, capturing its output as text"""
+        return subprocess.run(argv, capture_output=True, text=True, creationflags=NO_WINDOW, **kwargs)
+    
     def check_admin(self) -> bool:
         """Check if running as administrator"""
-        try:
-            import ctypes
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
-            return False
+        return is_admin()
+    
+    def preflight(self) -> Preflight:
+        """Check admin rights, NSSM and the install directories in one pass"""
+        return Preflight(
+            is_admin=bool(self.check_admin()),
+            has_nssm=os.path.exists(self.nssm_path),
+            service_dir_exists=os.path.isdir(self.service_dir),
+            log_dir_exists=os.path.isdir(self.log_dir)
+        )
     
     def stop_service(self, service_name: str) -> bool:
         """Stop a single service"""
         try:
-            result = subprocess.run(
-                ["sc", "stop", service_name],
-                capture_output=True,
-                text=True
-            )
+            result = self._run(["sc", "stop", service_name])
             self.log(f"Stopped {service_name}")
             return True
         except subprocess.CalledProcessError as e:
@@ -52,27 +116,53 @@ class ServiceManager:
     def uninstall_service(self, service_name: str) -> bool:
         """Uninstall a single service using NSSM"""
         try:
-            result = subprocess.run(
-                [self.nssm_path, "remove", service_name, "confirm"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            result = self._run([self.nssm_path, "remove", service_name, "confirm"], check=True)
             self.log(f"✅ {service_name} uninstalled")
             return True
         except subprocess.CalledProcessError as e:
             self.log(f"❌ Failed to uninstall {service_name}: {e.stderr}", "ERROR")
             return False
     
-    def cleanup_directories(self):
+    def stop_and_uninstall_batched(self):
+        """Stop and uninstall all services with a single PowerShell call
+        
+        Returns the number of services removed, or None if the batch did not run.
+        """
+        script = UNINSTALL_SCRIPT.format(
+            services=",".join(f"'{service}'" for service in self.services),
+            nssm=self.nssm_path
+        )
+        try:
+            result = self._run(["powershell", "-NoProfile", "-NonInteractive", "-Command", script])
+        except FileNotFoundError:
+            return None
+        
+        results = [line for line in result.stdout.splitlines() if line.startswith("RESULT|")]
+        if result.returncode != 0 or not results:
+            self.log(f"PowerShell exited with code {result.returncode}: {result.stderr.strip()}", "WARNING")
+        if not results:
+            # The script failed before reporting any service; redo them one by one
+            return None
+        
+        success_count = 0
+        for line in results:
+            _, service, exit_code, output = line.split("|", 3)
+            if exit_code == "0":
+                self.log(f"✅ {service} uninstalled")
+                success_count += 1
+            else:
+                self.log(f"❌ Failed to uninstall {service}: {output}", "ERROR")
+        return success_count
+    
+    def cleanup_directories(self, preflight: Preflight):
         """Clean up service directories"""
         try:
-            if os.path.exists(self.service_dir):
-                shutil.rmtree(self.service_dir)
+            if preflight.service_dir_exists:
+                fast_rmtree(self.service_dir)
                 self.log(f"Removed service directory: {self.service_dir}")
             
-            if os.path.exists(self.log_dir):
-                shutil.rmtree(self.log_dir)
+            if preflight.log_dir_exists:
+                fast_rmtree(self.log_dir)
                 self.log(f"Removed log directory: {self.log_dir}")
             
             return True
@@ -84,29 +174,35 @@ class ServiceManager:
         """Uninstall all Chaos World services"""
         self.log("Uninstalling Chaos World Backend Services...")
         
-        if not self.check_admin():
+        # Validate everything up front, before any service is stopped
+        preflight = self.preflight()
+        if not preflight.is_admin:
             self.log("This script must be run as Administrator!", "ERROR")
             self.log("Right-click and select 'Run as administrator'", "ERROR")
             return False
         
-        # Stop all services first
-        self.log("Stopping services...")
-        for service in self.services:
-            self.stop_service(service)
+        if not preflight.has_nssm:
+            self.log(f"NSSM not found at {self.nssm_path}", "ERROR")
+            self.log("Install it with 'choco install nssm'", "ERROR")
+            return False
         
-        # Wait a moment for services to stop
-        import time
-        time.sleep(3)
+        # Stop and uninstall everything in one batched PowerShell call
+        self.log("Stopping and uninstalling services...")
+        success_count = self.stop_and_uninstall_batched()
         
-        # Uninstall services
-        success_count = 0
-        for service in self.services:
-            if self.uninstall_service(service):
-                success_count += 1
+        if success_count is None:
+            # Batch unavailable or failed: fall back to one call per service, run in parallel
+            with ThreadPoolExecutor(max_workers=len(self.services)) as executor:
+                list(executor.map(self.stop_service, self.services))
+                
+                # Wait a moment for services to stop
+                time.sleep(3)
+                
+                success_count = sum(executor.map(self.uninstall_service, self.services))
         
         # Cleanup directories
         self.log("Cleaning up directories...")
-        self.cleanup_directories()
+        self.cleanup_directories(preflight)
         
         if success_count == len(self.services):
             self.log("", "SUCCESS")
@@ -10,9 +10,37 @@ import subprocess
 import time
 import requests
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from windows_utils import NO_WINDOW, is_admin
+
+# Shared keep-alive session for the HTTP probes
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+def tail_lines(path: str, n: int, block_size: int = 4096) -> list:
+    """Return the last n lines of a file, reading backwards from the end"""
+    if n <= 0:
+        return []
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        # n+1 newlines guarantees n complete lines even with a trailing newline
+        while end > 0 and newlines <= n:
+            start = max(0, end - block_size)
+            f.seek(start)
+            chunk = f.read(end - start)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+            end = start
+    return b''.join(reversed(chunks)).decode('utf-8', 'replace').splitlines()[-n:]
 
 class UserManagementServiceManager:
+    # How long an `sc query` answer is reused before asking the SCM again
+    STATUS_TTL = 0.5
+    
     def __init__(self):
         self.service_name = "ChaosWorld-UserManagement"
         self.service_url = "http://localhost:8082"
@@ -20,19 +48,23 @@ class UserManagementServiceManager:
         self.service_dir = r"C:\ChaosWorld\services"
         self.log_dir = r"C:\ChaosWorld\logs"
         self.nssm_path = r"C:\ProgramData\chocolatey\bin\nssm.exe"
+        # Set by get_service_status so the existence check can reuse its `sc query`
+        self._installed = None
+        self._status = None
+        self._status_time = 0.0
         
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
         timestamp = time.strftime("%H:%M:%S")
         print(f"[{timestamp}] {level}: {message}")
     
+    def _run(self, argv, **kwargs):
+        """Run a console tool without a window, capturing its output as text"""
+        return subprocess.run(argv, capture_output=True, text=True, creationflags=NO_WINDOW, **kwargs)
+    
     def check_admin(self) -> bool:
         """Check if running as administrator"""
-        try:
-            import ctypes
-            return ctypes.windll.shell32.IsUserAnAdmin()
-        except:
-            return False
+        return is_admin()
     
     def check_nssm(self) -> bool:
         """Check if NSSM is installed"""
@@ -40,34 +72,30 @@ class UserManagementServiceManager:
     
     def check_service_exists(self) -> bool:
         """Check if the service is installed"""
-        try:
-            result = subprocess.run(
-                ["sc", "query", self.service_name],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return "RUNNING" in result.stdout or "STOPPED" in result.stdout
-        except subprocess.CalledProcessError:
-            return False
+        if self._installed is None:
+            self.get_service_status()
+        return self._installed
     
     def get_service_status(self) -> str:
         """Get the current status of the service"""
+        now = time.monotonic()
+        if self._status is not None and now - self._status_time < self.STATUS_TTL:
+            return self._status
+        
         try:
-            result = subprocess.run(
-                ["sc", "query", self.service_name],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            result = self._run(["sc", "query", self.service_name], check=True)
+            self._installed = True
             if "RUNNING" in result.stdout:
-                return "RUNNING"
+                self._status = "RUNNING"
             elif "STOPPED" in result.stdout:
-                return "STOPPED"
+                self._status = "STOPPED"
             else:
-                return "UNKNOWN"
+                self._status = "UNKNOWN"
         except subprocess.CalledProcessError:
-            return "NOT_INSTALLED"
+            self._installed = False
+            self._status = "NOT_INSTALLED"
+        self._status_time = now
+        return self._status
     
     def start_service(self) -> bool:
         """Start the User Management service"""
@@ -81,12 +109,8 @@ class UserManagementServiceManager:
             return False
         
         try:
-            result = subprocess.run(
-                ["sc", "start", self.service_name],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            result = self._run(["sc", "start", self.service_name], check=True)
+            self._status = None
             self.log(f"✅ {self.service_name} started successfully")
             return True
         except subprocess.CalledProcessError as e:
@@ -100,12 +124,8 @@ class UserManagementServiceManager:
             return False
         
         try:
-            result = subprocess.run(
-                ["sc", "stop", self.service_name],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            result = self._run(["sc", "stop", self.service_name], check=True)
+            self._status = None
             self.log(f"✅ {self.service_name} stopped successfully")
             return True
         except subprocess.CalledProcessError as e:
@@ -128,7 +148,7 @@ class UserManagementServiceManager:
         if status == "RUNNING":
             # Test HTTP endpoint
             try:
-                response = requests.get(f"{self.service_url}/health", timeout=5)
+                response = SESSION.get(f"{self.service_url}/health", timeout=5)
                 if response.status_code == 200:
                     self.log("✅ Service is running and responding to HTTP requests")
                     return True
@@ -151,17 +171,25 @@ class UserManagementServiceManager:
             ("/", "Root Endpoint"),
         ]
         
-        success_count = 0
-        for endpoint, description in endpoints:
+        def probe(endpoint):
             try:
-                response = requests.get(f"{self.service_url}{endpoint}", timeout=5)
-                if response.status_code == 200:
-                    self.log(f"✅ {description}: OK")
-                    success_count += 1
-                else:
-                    self.log(f"❌ {description}: HTTP {response.status_code}", "ERROR")
+                return SESSION.get(f"{self.service_url}{endpoint}", timeout=5)
             except requests.exceptions.RequestException as e:
-                self.log(f"❌ {description}: {e}", "ERROR")
+                return e
+        
+        # Probe all endpoints at once, then report in order
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            results = list(executor.map(probe, [endpoint for endpoint, _ in endpoints]))
+        
+        success_count = 0
+        for (endpoint, description), response in zip(endpoints, results):
+            if isinstance(response, Exception):
+                self.log(f"❌ {description}: {response}", "ERROR")
+            elif response.status_code == 200:
+                self.log(f"✅ {description}: OK")
+                success_count += 1
+            else:
+                self.log(f"❌ {description}: HTTP {response.status_code}", "ERROR")
         
         self.log(f"Test Results: {success_count}/{len(endpoints)} endpoints working")
         return success_count == len(endpoints)
@@ -174,16 +202,14 @@ class UserManagementServiceManager:
             return False
         
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-                recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-                
-                self.log(f"Recent {len(recent_lines)} lines from {log_file}:")
-                print("-" * 80)
-                for line in recent_lines:
-                    print(line.rstrip())
-                print("-" * 80)
-                return True
+            recent_lines = tail_lines(log_file, lines)
+            
+            self.log(f"Recent {len(recent_lines)} lines from {log_file}:")
+            print("-" * 80)
+            for line in recent_lines:
+                print(line.rstrip())
+            print("-" * 80)
+            return True
         except Exception as e:
             self.log(f"Failed to read log file: {e}", "ERROR")
             return False
@@ -199,13 +225,7 @@ class UserManagementServiceManager:
         
         try:
             # Change to service directory and build
-            result = subprocess.run(
-                ["cargo", "build", "--release", "--bin", "user-management"],
-                cwd=service_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            result = self._run(["cargo", "build", "--release", "--bin", "user-management"], cwd=service_path, check=True)
             self.log("✅ User Management service built successfully")
             
             # Copy executable to service directory
@@ -230,17 +250,16 @@ class UserManagementServiceManager:
             return False
         
         try:
-            # Set environment variables
-            env = os.environ.copy()
-            env["RUST_LOG"] = "info"
-            env["USER_MANAGEMENT_PORT"] = str(port)
-            env["MONGODB_URL"] = "mongodb://localhost:27017"
-            
-            # Run the service
+            # Run the service with the dev settings layered over our environment
             subprocess.run(
                 ["cargo", "run", "--bin", "user-management"],
                 cwd=service_path,
-                env=env
+                env={
+                    **os.environ,
+                    "RUST_LOG": "info",
+                    "USER_MANAGEMENT_PORT": str(port),
+                    "MONGODB_URL": "mongodb://localhost:27017",
+                }
             )
             return True
         except KeyboardInterrupt:
@@ -5,16 +5,131 @@ Check what's available in Grafana and Prometheus
 """
 
 import requests
+import heapq
 import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+
+# orjson parses straight from bytes in C; fall back to the stdlib when absent
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# One pooled keep-alive session shared by every check
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+GRAFANA_AUTH = HTTPBasicAuth("admin", "admin123")
+
+PROM_TARGETS_URL = "http://localhost:9091/api/v1/targets"
+# Precomputed head stats: series total plus the top 20 metric names in one small response
+PROM_TSDB_URL = "http://localhost:9091/api/v1/status/tsdb?limit=20"
+PROM_METRICS_URL = "http://localhost:9091/api/v1/label/__name__/values"
+GRAFANA_DASHBOARDS_URL = "http://localhost:3001/api/search?type=dash-db"
+GRAFANA_DATASOURCES_URL = "http://localhost:3001/api/datasources"
+CMS_METRICS_URL = "http://localhost:9090/metrics"
+
+# A sample line: not a # comment and not blank, checked in one C-level match on raw bytes
+SAMPLE_LINE = re.compile(rb'(?!#)\s*\S').match
+
+# (url, request kwargs) for every check, so they can all be fetched up front
+CHECK_REQUESTS = (
+    (PROM_TARGETS_URL, {"timeout": 10}),
+    (PROM_TSDB_URL, {"timeout": 10}),
+    (GRAFANA_DASHBOARDS_URL, {"auth": GRAFANA_AUTH, "timeout": 10}),
+    (GRAFANA_DATASOURCES_URL, {"auth": GRAFANA_AUTH, "timeout": 10}),
+    (CMS_METRICS_URL, {"timeout": 10, "stream": True}),
+)
+
+# Grafana listings are memoized on disk so quick reruns during setup skip them;
+# error responses are only kept briefly so a fixed problem shows up right away.
+# Once an entry goes stale its ETag is sent back, and a 304 reuses the cached body.
+CACHE_FILE = Path.home() / ".cache" / "chaosworld_mon" / "http_cache.json"
+CACHE_TTL = 30
+ERROR_CACHE_TTL = 5
+
+def _load_cache():
+    try:
+        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+_cache = _load_cache()
+_prefetched = {}
+
+def cached_entry(url):
+    """Return the cached response for url if it is still fresh"""
+    entry = _cache.get(url)
+    if entry is None:
+        return None
+    ttl = CACHE_TTL if entry["status"] == 200 else ERROR_CACHE_TTL
+    if time.time() - entry["time"] > ttl:
+        return None
+    return entry
+
+def conditional_headers(url):
+    """If-None-Match header for a cached response that carries an ETag"""
+    entry = _cache.get(url)
+    if entry is not None and entry.get("etag"):
+        return {"If-None-Match": entry["etag"]}
+    return {}
+
+def _save_cache():
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_FILE.write_text(json.dumps(_cache), encoding="utf-8")
+    except OSError:
+        pass
+
+def prefetch_checks(executor):
+    """Start every check's request concurrently; the checks still print in order"""
+    for url, kwargs in CHECK_REQUESTS:
+        if cached_entry(url) is None:
+            _prefetched[url] = executor.submit(SESSION.get, url, headers=conditional_headers(url), **kwargs)
+
+def fetch(url, **kwargs):
+    """GET through the shared session, using the prefetched response when there is one"""
+    future = _prefetched.pop(url, None)
+    if future is not None:
+        return future.result()
+    return SESSION.get(url, **kwargs)
+
+def fetch_json_cached(url, **kwargs):
+    """GET a JSON listing through the disk cache; returns (status, body, cached)"""
+    entry = cached_entry(url)
+    if entry is not None:
+        return entry["status"], entry["body"], True
+    
+    response = fetch(url, headers=conditional_headers(url), **kwargs)
+    if response.status_code == 304:
+        # Unchanged since the cached copy: no body was sent, reuse ours
+        entry = _cache[url]
+        entry["time"] = time.time()
+        _save_cache()
+        return entry["status"], entry["body"], True
+    
+    body = _json_loads(response.content) if response.status_code == 200 else None
+    _cache[url] = {
+        "time": time.time(),
+        "status": response.status_code,
+        "body": body,
+        "etag": response.headers.get("ETag") if response.status_code == 200 else None
+    }
+    _save_cache()
+    return response.status_code, body, False
 
 def check_prometheus_targets():
     """Check Prometheus targets"""
     print("🔍 Checking Prometheus targets...")
     try:
-        response = requests.get("http://localhost:9091/api/v1/targets", timeout=10)
+        response = fetch(PROM_TARGETS_URL, timeout=10)
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             targets = data['data']['activeTargets']
             
             print(f"📊 Found {len(targets)} targets:")
@@ -31,16 +146,37 @@ def check_prometheus_targets():
         return 0
 
 def check_prometheus_metrics():
-    """Check available metrics in Prometheus"""
+    """Check available metrics in Prometheus and return the head series count"""
     print("\n📈 Checking Prometheus metrics...")
     try:
-        response = requests.get("http://localhost:9091/api/v1/label/__name__/values", timeout=10)
+        response = fetch(PROM_TSDB_URL, timeout=10)
+        if response.status_code != 200:
+            # Older Prometheus without the TSDB status endpoint: count metric names instead
+            return check_prometheus_metric_names()
+        
+        stats = _json_loads(response.content)['data']
+        top_metrics = stats['seriesCountByMetricName']
+        num_series = stats['headStats']['numSeries']
+        
+        print(f"📊 Found {num_series} series, top {len(top_metrics)} metrics:")
+        for metric in top_metrics:
+            print(f"  • {metric['name']} ({metric['value']} series)")
+        
+        return num_series
+    except Exception as e:
+        print(f"❌ Prometheus metrics error: {e}")
+        return 0
+
+def check_prometheus_metric_names():
+    """Count metric names via the label values API"""
+    try:
+        response = fetch(PROM_METRICS_URL, timeout=10)
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             metrics = data['data']
             
             print(f"📊 Found {len(metrics)} metrics:")
-            for metric in sorted(metrics)[:20]:  # Show first 20
+            for metric in heapq.nsmallest(20, metrics):  # Show first 20
                 print(f"  • {metric}")
             
             if len(metrics) > 20:
@@ -58,18 +194,15 @@ def check_grafana_dashboards():
     """Check Grafana dashboards"""
     print("\n📊 Checking Grafana dashboards...")
     try:
-        response = requests.get("http://localhost:3001/api/search?type=dash-db", 
-                              auth=("admin", "admin123"), timeout=10)
-        if response.status_code == 200:
-            dashboards = response.json()
-            
-            print(f"📈 Found {len(dashboards)} dashboards:")
+        status, dashboards, cached = fetch_json_cached(GRAFANA_DASHBOARDS_URL, auth=GRAFANA_AUTH, timeout=10)
+        if status == 200:
+            print(f"📈 Found {len(dashboards)} dashboards:{' (cached)' if cached else ''}")
             for dashboard in dashboards:
                 print(f"  • {dashboard['title']} (ID: {dashboard['id']})")
             
             return len(dashboards)
         else:
-            print(f"❌ Grafana API error: {response.status_code}")
+            print(f"❌ Grafana API error: {status}{' (cached)' if cached else ''}")
             return 0
     except Exception as e:
         print(f"❌ Grafana error: {e}")
@@ -79,18 +212,15 @@ def check_grafana_datasources():
     """Check Grafana datasources"""
     print("\n🔗 Checking Grafana datasources...")
     try:
-        response = requests.get("http://localhost:3001/api/datasources", 
-                              auth=("admin", "admin123"), timeout=10)
-        if response.status_code == 200:
-            datasources = response.json()
-            
-            print(f"📊 Found {len(datasources)} datasources:")
+        status, datasources, cached = fetch_json_cached(GRAFANA_DATASOURCES_URL, auth=GRAFANA_AUTH, timeout=10)
+        if status == 200:
+            print(f"📊 Found {len(datasources)} datasources:{' (cached)' if cached else ''}")
             for ds in datasources:
                 print(f"  • {ds['name']} ({ds['type']}) - {ds['url']}")
             
             return len(datasources)
         else:
-            print(f"❌ Grafana datasources API error: {response.status_code}")
+            print(f"❌ Grafana datasources API error: {status}{' (cached)' if cached else ''}")
             return 0
     except Exception as e:
         print(f"❌ Grafana datasources error: {e}")
@@ -100,23 +230,27 @@ def check_cms_metrics():
     """Check CMS metrics directly"""
     print("\n🔍 Checking CMS metrics...")
     try:
-        response = requests.get("http://localhost:9090/metrics", timeout=10)
-        if response.status_code == 200:
-            metrics_text = response.text
-            lines = metrics_text.split('\n')
-            metric_lines = [line for line in lines if not line.startswith('#') and line.strip()]
+        with fetch(CMS_METRICS_URL, timeout=10, stream=True) as response:
+            if response.status_code != 200:
+                print(f"❌ CMS metrics error: {response.status_code}")
+                return 0
             
-            print(f"📊 CMS exposing {len(metric_lines)} metrics:")
-            for line in metric_lines[:10]:  # Show first 10
-                print(f"  • {line}")
-            
-            if len(metric_lines) > 10:
-                print(f"  ... and {len(metric_lines) - 10} more")
-            
-            return len(metric_lines)
-        else:
-            print(f"❌ CMS metrics error: {response.status_code}")
-            return 0
+            # Count samples as the body streams in, decoding only the first 10
+            count = 0
+            head = []
+            for line in filter(SAMPLE_LINE, response.iter_lines()):
+                count += 1
+                if len(head) < 10:
+                    head.append(line.decode('utf-8', 'replace'))
+        
+        print(f"📊 CMS exposing {count} metrics:")
+        for line in head:
+            print(f"  • {line}")
+        
+        if count > 10:
+            print(f"  ... and {count - 10} more")
+        
+        return count
     except Exception as e:
         print(f"❌ CMS metrics error: {e}")
         return 0
@@ -126,21 +260,23 @@ def main():
     print("🧪 Chaos World Monitoring Verification")
     print("=" * 50)
     
-    # Check all components
-    targets_up = check_prometheus_targets()
-    metrics_count = check_prometheus_metrics()
-    dashboards_count = check_grafana_dashboards()
-    datasources_count = check_grafana_datasources()
-    cms_metrics_count = check_cms_metrics()
+    # Check all components; the requests run concurrently, the reports stay in order
+    with SESSION, ThreadPoolExecutor(max_workers=len(CHECK_REQUESTS)) as executor:
+        prefetch_checks(executor)
+        targets_up = check_prometheus_targets()
+        series_count = check_prometheus_metrics()
+        dashboards_count = check_grafana_dashboards()
+        datasources_count = check_grafana_datasources()
+        cms_metrics_count = check_cms_metrics()
     
     print("\n📋 Summary:")
     print(f"  Prometheus targets UP: {targets_up}")
-    print(f"  Prometheus metrics: {metrics_count}")
+    print(f"  Prometheus series: {series_count}")
     print(f"  Grafana dashboards: {dashboards_count}")
     print(f"  Grafana datasources: {datasources_count}")
     print(f"  CMS metrics: {cms_metrics_count}")
     
-    if targets_up > 0 and metrics_count > 0 and dashboards_count > 0:
+    if targets_up > 0 and series_count > 0 and dashboards_count > 0:
         print("\n✅ Monitoring stack is working!")
         print("📈 Open Grafana: http://localhost:3001")
         print("📊 Open Prometheus: http://localhost:9091")
@@ -153,7 +289,7 @@ def main():
         print("\n⚠️ Some components need attention")
         if targets_up == 0:
             print("  • Check Prometheus targets configuration")
-        if metrics_count == 0:
+        if series_count == 0:
             print("  • Check if services are exposing metrics")
         if dashboards_count == 0:
             print("  • Check Grafana dashboard provisioning")
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Windows Utilities
+Admin and console-window helpers shared by the service management scripts
+"""
+
+import ctypes
+import functools
+import subprocess
+
+# Console programs like sc/nssm otherwise get a conhost attached for every call
+# (CREATE_NO_WINDOW only exists on Windows)
+NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+@functools.cache
+def is_admin() -> bool:
+    """Whether the script runs as administrator (checked once per process)"""
+    try:
+        return bool(ctypes.windll.shell32.IsUserAnAdmin())
+    except (AttributeError, OSError):
+        # windll only exists on Windows
+        return False
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Shared MongoDB Connection
+One pooled client per process for the chaos-backend scripts.
+"""
+
+from functools import lru_cache
+import pymongo
+
+MONGO_URI = "mongodb://localhost:27017"
+DATABASE_NAME = "chaos_game"
+
+@lru_cache(maxsize=None)
+def get_client():
+    """Return the process-wide MongoClient, created on first use"""
+    return pymongo.MongoClient(
+        MONGO_URI,
+        # Single local server: connect directly instead of running topology discovery
+        directConnection=True,
+        serverSelectionTimeoutMS=1000,
+        connectTimeoutMS=1000,
+        maxPoolSize=4,
+        minPoolSize=0,
+        appname="chaos-scripts"
+    )
+
+def get_db():
+    """Return the chaos_game database on the shared client"""
+    return get_client()[DATABASE_NAME]
@@ -17,7 +17,7 @@ async function checkMongoDBData() {
         const collections = await db.listCollections().toArray();
         
         for (const collection of collections) {
-            const count = await db.collection(collection.name).countDocuments();
+            const count = await db.collection(collection.name).estimatedDocumentCount();
             console.log(`  - ${collection.name}: ${count} documents`);
         }
         
@@ -50,7 +50,7 @@ async function checkMongoDBData() {
             for (const collection of configCollections) {
                 console.log(`\n📁 Collection: ${collection.name}`);
                 const coll = db.collection(collection.name);
-                const count = await coll.countDocuments();
+                const count = await coll.estimatedDocumentCount();
                 console.log(`  Total documents: ${count}`);
                 
                 if (count > 0) {
@@ -91,7 +91,7 @@ async function checkMongoDBData() {
         
         let totalConfigDocs = 0;
         for (const collection of configCollections) {
-            const count = await db.collection(collection.name).countDocuments();
+            const count = await db.collection(collection.name).estimatedDocumentCount();
             totalConfigDocs += count;
         }
         
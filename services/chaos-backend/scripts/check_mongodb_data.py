@@ -3,7 +3,7 @@
 Script to check MongoDB data structure and organization
 """
 
-import pymongo
+from _mongo import get_client, get_db
 from pprint import pprint
 import json
 
@@ -11,8 +11,8 @@ def check_mongodb_data():
     """Check MongoDB data structure and organization"""
     
     # Connect to MongoDB
-    client = pymongo.MongoClient("mongodb://localhost:27017")
-    db = client["chaos_game"]
+    client = get_client()
+    db = get_db()
     
     print("=" * 60)
     print("🔍 MONGODB DATA STRUCTURE ANALYSIS")
@@ -21,16 +21,17 @@ def check_mongodb_data():
     # List all collections
     print("\n📋 COLLECTIONS IN DATABASE:")
     collections = db.list_collection_names()
+    # Count every collection once; the sections below reuse these
+    counts = {name: db[name].estimated_document_count() for name in collections}
     for collection_name in collections:
-        count = db[collection_name].count_documents({})
-        print(f"  - {collection_name}: {count} documents")
+        print(f"  - {collection_name}: {counts[collection_name]} documents")
     
     print("\n" + "=" * 60)
     
     # Check runtime_flags collection
     print("\n🚩 RUNTIME FLAGS COLLECTION:")
     runtime_flags = db["runtime_flags"]
-    flags_docs = list(runtime_flags.find())
+    flags_docs = list(runtime_flags.find().batch_size(100))
     
     for doc in flags_docs:
         print(f"\n📄 Document ID: {doc.get('_id')}")
@@ -50,10 +51,11 @@ def check_mongodb_data():
             collection = db[collection_name]
             
             # Get sample documents
-            sample_docs = list(collection.find().limit(5))
+            # One batch sized to the sample, so no getMore is ever needed
+            sample_docs = list(collection.find().limit(5).batch_size(5))
             
             if sample_docs:
-                print(f"  Total documents: {collection.count_documents({})}")
+                print(f"  Total documents: {counts[collection_name]}")
                 print(f"  Sample documents:")
                 
                 for i, doc in enumerate(sample_docs):
@@ -84,7 +86,7 @@ def check_mongodb_data():
         for collection_name in actor_collections:
             print(f"\n📁 Collection: {collection_name}")
             collection = db[collection_name]
-            count = collection.count_documents({})
+            count = counts[collection_name]
             print(f"  Total documents: {count}")
             
             if count > 0:
@@ -104,7 +106,7 @@ def check_mongodb_data():
         for collection_name in resource_collections:
             print(f"\n📁 Collection: {collection_name}")
             collection = db[collection_name]
-            count = collection.count_documents({})
+            count = counts[collection_name]
             print(f"  Total documents: {count}")
             
             if count > 0:
@@ -121,9 +123,7 @@ def check_mongodb_data():
     print(f"  Total collections: {len(collections)}")
     print(f"  Runtime flags: {len(flags_docs)} documents")
     
-    total_config_docs = 0
-    for collection_name in config_collections:
-        total_config_docs += db[collection_name].count_documents({})
+    total_config_docs = sum(counts[name] for name in config_collections)
     
     print(f"  Configuration documents: {total_config_docs}")
     
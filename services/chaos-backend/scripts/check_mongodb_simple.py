@@ -1,29 +1,28 @@
 #!/usr/bin/env python3
 """
-Simple MongoDB data check using mongo shell commands
+Simple MongoDB data check over a single pymongo connection
 """
 
-import subprocess
-import json
-import sys
+from concurrent.futures import ThreadPoolExecutor
+from pymongo.errors import PyMongoError
+from _mongo import get_client, get_db
 
-def run_mongo_command(command):
-    """Run a MongoDB command and return the result"""
-    try:
-        result = subprocess.run(
-            ["mongosh", "mongodb://localhost:27017/chaos_game", "--eval", command, "--quiet"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Error running MongoDB command: {e}")
-        print(f"Error output: {e.stderr}")
-        return None
-    except FileNotFoundError:
-        print("mongosh not found. Please install MongoDB Shell or use MongoDB Compass")
-        return None
+def print_sample_documents(docs):
+    """Print a short per-field summary of sample documents"""
+    print(f"  Sample documents:")
+    
+    for i, doc in enumerate(docs):
+        print(f"\n  📄 Document {i+1}:")
+        print(f"    ID: {doc.get('_id')}")
+        
+        for key, value in doc.items():
+            if key != '_id':
+                if isinstance(value, dict):
+                    print(f"    {key}: Object with {len(value)} keys")
+                elif isinstance(value, list):
+                    print(f"    {key}: Array with {len(value)} items")
+                else:
+                    print(f"    {key}: {value} ({type(value).__name__})")
 
 def check_mongodb_data():
     """Check MongoDB data structure"""
@@ -32,98 +31,75 @@ def check_mongodb_data():
     print("🔍 MONGODB DATA STRUCTURE ANALYSIS")
     print("=" * 60)
     
-    # List all collections
-    print("\n📋 COLLECTIONS IN DATABASE:")
-    collections_result = run_mongo_command("db.runCommand('listCollections').cursor.firstBatch.map(c => c.name)")
-    
-    if collections_result:
-        try:
-            collections = json.loads(collections_result)
-            for collection in collections:
-                count_result = run_mongo_command(f"db.{collection}.countDocuments()")
-                if count_result:
-                    print(f"  - {collection}: {count_result} documents")
-        except json.JSONDecodeError:
-            print("  Error parsing collections list")
-    else:
-        print("  Error getting collections list")
-    
-    print("\n" + "=" * 60)
-    
-    # Check runtime_flags collection
-    print("\n🚩 RUNTIME FLAGS COLLECTION:")
-    flags_result = run_mongo_command("db.runtime_flags.find().toArray()")
-    
-    if flags_result:
-        try:
-            flags_docs = json.loads(flags_result)
-            for doc in flags_docs:
-                print(f"\n📄 Document ID: {doc.get('_id')}")
-                for key, value in doc.items():
-                    if key != '_id':
-                        print(f"  {key}: {value} ({type(value).__name__})")
-        except json.JSONDecodeError:
-            print("  Error parsing runtime flags")
-    else:
-        print("  Error getting runtime flags")
-    
-    print("\n" + "=" * 60)
-    
-    # Check configurations collection
-    print("\n⚙️  CONFIGURATION COLLECTIONS:")
-    
-    # Look for any collection with 'config' in the name
-    config_collections = []
-    if collections_result:
+    # One client and connection pool for every query below
+    client = get_client()
+    try:
+        db = get_db()
+        
+        # List all collections
+        print("\n📋 COLLECTIONS IN DATABASE:")
         try:
-            collections = json.loads(collections_result)
-            config_collections = [c for c in collections if 'config' in c.lower()]
-        except json.JSONDecodeError:
-            pass
-    
-    if config_collections:
-        for collection_name in config_collections:
-            print(f"\n📁 Collection: {collection_name}")
-            count_result = run_mongo_command(f"db.{collection_name}.countDocuments()")
-            if count_result:
-                print(f"  Total documents: {count_result}")
+            collections = db.list_collection_names()
+        except PyMongoError as e:
+            print(f"  Error getting collections list: {e}")
+            return False
+        
+        # Look for any collection with 'config' in the name
+        config_collections = [c for c in collections if 'config' in c.lower()]
+        
+        # Issue every per-collection query at once over the client's pool (4 connections), so the
+        # round trips overlap; results are printed in order below
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            # Collection metadata counts; no scan like countDocuments
+            count_futures = {name: executor.submit(db[name].estimated_document_count) for name in collections}
+            flags_future = executor.submit(lambda: list(db.runtime_flags.find().batch_size(100)))
+            sample_futures = {
+                name: executor.submit(lambda name=name: list(db[name].find().limit(3).batch_size(3)))
+                for name in config_collections
+            }
+            counts = {name: future.result() for name, future in count_futures.items()}
+        
+        for collection in collections:
+            print(f"  - {collection}: {counts[collection]} documents")
+        
+        print("\n" + "=" * 60)
+        
+        # Check runtime_flags collection
+        print("\n🚩 RUNTIME FLAGS COLLECTION:")
+        for doc in flags_future.result():
+            print(f"\n📄 Document ID: {doc.get('_id')}")
+            for key, value in doc.items():
+                if key != '_id':
+                    print(f"  {key}: {value} ({type(value).__name__})")
+        
+        print("\n" + "=" * 60)
+        
+        # Check configurations collection
+        print("\n⚙️  CONFIGURATION COLLECTIONS:")
+        
+        if config_collections:
+            for collection_name in config_collections:
+                print(f"\n📁 Collection: {collection_name}")
+                print(f"  Total documents: {counts[collection_name]}")
                 
                 # Get sample documents
-                sample_result = run_mongo_command(f"db.{collection_name}.find().limit(3).toArray()")
-                if sample_result:
-                    try:
-                        sample_docs = json.loads(sample_result)
-                        print(f"  Sample documents:")
-                        
-                        for i, doc in enumerate(sample_docs):
-                            print(f"\n  📄 Document {i+1}:")
-                            print(f"    ID: {doc.get('_id')}")
-                            
-                            for key, value in doc.items():
-                                if key != '_id':
-                                    if isinstance(value, dict):
-                                        print(f"    {key}: Object with {len(value)} keys")
-                                    elif isinstance(value, list):
-                                        print(f"    {key}: Array with {len(value)} items")
-                                    else:
-                                        print(f"    {key}: {value} ({type(value).__name__})")
-                    except json.JSONDecodeError:
-                        print("  Error parsing sample documents")
-    else:
-        print("  No configuration collections found")
-    
-    print("\n" + "=" * 60)
-    
-    # Summary
-    print("\n📊 SUMMARY:")
-    if collections_result:
-        try:
-            collections = json.loads(collections_result)
-            print(f"  Total collections: {len(collections)}")
-        except json.JSONDecodeError:
-            print("  Error getting collections count")
-    
-    print("\n✅ MongoDB data structure analysis completed!")
+                print_sample_documents(sample_futures[collection_name].result())
+        else:
+            print("  No configuration collections found")
+        
+        print("\n" + "=" * 60)
+        
+        # Summary
+        print("\n📊 SUMMARY:")
+        print(f"  Total collections: {len(collections)}")
+        
+        print("\n✅ MongoDB data structure analysis completed!")
+        return True
+    except PyMongoError as e:
+        print(f"❌ MongoDB error: {e}")
+        return False
+    finally:
+        client.close()
 
 if __name__ == "__main__":
     check_mongodb_data()
@@ -4,20 +4,41 @@ MongoDB Setup Script for Chaos Backend Service
 This script sets up the MongoDB database with runtime flags and configuration.
 """
 
-import pymongo
+from pymongo import ASCENDING, IndexModel, ReplaceOne, WriteConcern
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 import sys
+from _mongo import get_db
+
+# (category, key, value, value_type) for each seeded configuration entry
+DEFAULT_CONFIGS = (
+    ("defaults", "default_actor_health", 100, "integer"),
+    ("defaults", "default_actor_level", 1, "integer"),
+    ("defaults", "default_actor_experience", 0, "integer"),
+    ("logging", "level", "info", "string"),
+    ("metrics", "enabled", True, "boolean"),
+)
+
+# Seed data is regenerable by rerunning this script, so don't wait on the journal
+SEED_WRITE_CONCERN = WriteConcern(w=1, j=False)
+
+# Append-only collections: the server drops documents once their timestamp is this old
+TTL_SECONDS = {
+    "game_events": 7 * 24 * 3600,
+    "performance_metrics": 24 * 3600,
+}
 
 def setup_mongodb():
     """Setup MongoDB with runtime flags and configuration"""
     
     # MongoDB connection
-    client = pymongo.MongoClient("mongodb://localhost:27017")
-    db = client["chaos_game"]
+    db = get_db()
     
     print("🔗 Connected to MongoDB")
     
+    # One timestamp for everything seeded in this run
+    now = datetime.now(timezone.utc)
+    
     # Create collections
     collections = [
         "runtime_flags",
@@ -27,8 +48,10 @@ def setup_mongodb():
         "performance_metrics"
     ]
     
+    # One listCollections call, restricted to the names we care about
+    existing = set(db.list_collection_names(filter={"name": {"$in": collections}}))
     for collection_name in collections:
-        if collection_name not in db.list_collection_names():
+        if collection_name not in existing:
             db.create_collection(collection_name)
             print(f"📁 Created collection: {collection_name}")
         else:
@@ -48,12 +71,12 @@ def setup_mongodb():
         "enable_health_checks": True,
         "world_size": 10000,
         "max_actors": 10000,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
+        "created_at": now,
+        "updated_at": now
     }
     
     # Insert or update runtime flags
-    db.runtime_flags.replace_one(
+    db.get_collection("runtime_flags", write_concern=SEED_WRITE_CONCERN).replace_one(
         {"_id": "runtime_config"}, 
         runtime_flags, 
         upsert=True
@@ -63,75 +86,43 @@ def setup_mongodb():
     # Setup default configurations
     default_configs = [
         {
-            "_id": "defaults.default_actor_health",
-            "category": "defaults",
-            "key": "default_actor_health",
-            "value": 100,
-            "value_type": "integer",
-            "source_provider": "mongodb",
-            "priority": 1,
-            "created_at": datetime.utcnow()
-        },
-        {
-            "_id": "defaults.default_actor_level",
-            "category": "defaults", 
-            "key": "default_actor_level",
-            "value": 1,
-            "value_type": "integer",
-            "source_provider": "mongodb",
-            "priority": 1,
-            "created_at": datetime.utcnow()
-        },
-        {
-            "_id": "defaults.default_actor_experience",
-            "category": "defaults",
-            "key": "default_actor_experience", 
-            "value": 0,
-            "value_type": "integer",
+            "_id": f"{category}.{key}",
+            "category": category,
+            "key": key,
+            "value": value,
+            "value_type": value_type,
             "source_provider": "mongodb",
             "priority": 1,
-            "created_at": datetime.utcnow()
-        },
-        {
-            "_id": "logging.level",
-            "category": "logging",
-            "key": "level",
-            "value": "info",
-            "value_type": "string",
-            "source_provider": "mongodb",
-            "priority": 1,
-            "created_at": datetime.utcnow()
-        },
-        {
-            "_id": "metrics.enabled",
-            "category": "metrics",
-            "key": "enabled",
-            "value": True,
-            "value_type": "boolean",
-            "source_provider": "mongodb",
-            "priority": 1,
-            "created_at": datetime.utcnow()
+            "created_at": now
         }
+        for category, key, value, value_type in DEFAULT_CONFIGS
     ]
     
-    for config in default_configs:
-        db.configurations.replace_one(
-            {"_id": config["_id"]},
-            config,
-            upsert=True
-        )
+    # All upserts in a single bulk write command
+    db.get_collection("configurations", write_concern=SEED_WRITE_CONCERN).bulk_write(
+        [ReplaceOne({"_id": config["_id"]}, config, upsert=True) for config in default_configs],
+        ordered=False
+    )
     
     print("⚙️  Default configurations loaded")
     
-    # Create indexes
-    db.runtime_flags.create_index("_id")
-    db.configurations.create_index("category")
-    db.configurations.create_index("key")
-    db.actors.create_index("id")
-    db.actors.create_index("race")
-    db.actors.create_index("level")
-    db.game_events.create_index("timestamp")
-    db.performance_metrics.create_index("timestamp")
+    # Create indexes: one createIndexes command per collection (existing identical
+    # indexes are a no-op; _id is always indexed by MongoDB itself)
+    indexes = {
+        "configurations": ["category", "key"],
+        "actors": ["id", "race", "level"]
+    }
+    for collection_name, fields in indexes.items():
+        db[collection_name].create_indexes([IndexModel([(field, ASCENDING)]) for field in fields])
+    
+    for collection_name, ttl in TTL_SECONDS.items():
+        collection = db[collection_name]
+        # Older setups created a plain timestamp index; its options can't be
+        # changed by create_index, so replace it
+        existing = collection.index_information().get("timestamp_1")
+        if existing is not None and existing.get("expireAfterSeconds") != ttl:
+            collection.drop_index("timestamp_1")
+        collection.create_index("timestamp", expireAfterSeconds=ttl)
     
     print("📊 Database indexes created")
     
@@ -4,10 +4,49 @@ Update Runtime Flags Script
 This script allows you to update runtime flags in MongoDB without restarting the server.
 """
 
-import pymongo
 import json
+import os
 import sys
-from datetime import datetime
+from pymongo import ReturnDocument
+from _mongo import get_client, get_db
+
+def parse_value(flag_value):
+    """Convert a command-line value to its JSON type, falling back to a plain string"""
+    # Keep accepting True/FALSE etc. the way the old parser did
+    if flag_value.lower() in ['true', 'false', 'null']:
+        flag_value = flag_value.lower()
+    try:
+        return json.loads(flag_value)
+    except ValueError:
+        return flag_value
+
+def set_flag(db, flag_name, flag_value):
+    """Write one flag to the runtime config document"""
+    print(f"🔄 Updating flag: {flag_name} = {flag_value}")
+    
+    # Update the flag and read back the stored value in the same round trip;
+    # the server stamps updated_at atomically with the write
+    flags = db.runtime_flags.find_one_and_update(
+        {"_id": "runtime_config"},
+        {
+            "$set": {flag_name: flag_value},
+            "$currentDate": {"updated_at": {"$type": "date"}}
+        },
+        projection={"_id": 0, flag_name: 1, "updated_at": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    
+    if flags is not None:
+        # A dotted name like logging.level comes back nested, so follow the path
+        stored = flags
+        for part in flag_name.split("."):
+            stored = stored.get(part, flag_value) if isinstance(stored, dict) else flag_value
+        print(f"✅ Successfully updated {flag_name} to {stored} (at {flags['updated_at']})")
+        print("🔄 Server will pick up the change on next config sync")
+        return True
+    else:
+        print(f"❌ Failed to update {flag_name}: no runtime flags found, run setup_mongodb.py first")
+        return False
 
 def update_runtime_flags():
     """Update runtime flags in MongoDB"""
@@ -17,63 +56,65 @@ def update_runtime_flags():
         print("Example: python update_flags.py server_port 9090")
         print("Example: python update_flags.py max_connections 2000")
         print("Example: python update_flags.py enable_mongodb_sync false")
+        print("Set CHAOS_FLAG_DAEMON=1 to enter several flags over one connection")
         sys.exit(1)
     
     flag_name = sys.argv[1]
-    flag_value = sys.argv[2]
-    
-    # Parse value type
-    if flag_value.lower() in ['true', 'false']:
-        flag_value = flag_value.lower() == 'true'
-    elif flag_value.isdigit():
-        flag_value = int(flag_value)
-    elif flag_value.replace('.', '').isdigit():
-        flag_value = float(flag_value)
+    flag_value = parse_value(sys.argv[2])
     
     # MongoDB connection
-    client = pymongo.MongoClient("mongodb://localhost:27017")
-    db = client["chaos_game"]
+    db = get_db()
     
     print(f"🔗 Connected to MongoDB")
-    print(f"🔄 Updating flag: {flag_name} = {flag_value}")
     
-    # Update the flag
-    result = db.runtime_flags.update_one(
-        {"_id": "runtime_config"},
-        {
-            "$set": {
-                flag_name: flag_value,
-                "updated_at": datetime.utcnow()
-            }
-        }
-    )
-    
-    if result.modified_count > 0:
-        print(f"✅ Successfully updated {flag_name} to {flag_value}")
-        print("🔄 Server will pick up the change on next config sync")
-    else:
-        print(f"❌ Failed to update {flag_name}")
+    if not set_flag(db, flag_name, flag_value):
         sys.exit(1)
 
+def run_daemon():
+    """Apply '<flag_name> <value>' lines from stdin over one long-lived client"""
+    
+    client = get_client()
+    db = get_db()
+    
+    print("🔗 Connected to MongoDB")
+    print("📝 Enter '<flag_name> <value>' per line (Ctrl+D or Ctrl+Z to quit)")
+    
+    try:
+        for line in sys.stdin:
+            parts = line.split(None, 1)
+            if not parts:
+                continue
+            if len(parts) < 2:
+                print("❌ Expected: <flag_name> <value>")
+                continue
+            set_flag(db, parts[0], parse_value(parts[1].strip()))
+    finally:
+        client.close()
+
 def list_flags():
     """List all current runtime flags"""
     
-    client = pymongo.MongoClient("mongodb://localhost:27017")
-    db = client["chaos_game"]
+    db = get_db()
     
     print("🔗 Connected to MongoDB")
     print("📋 Current runtime flags:")
     
-    flags = db.runtime_flags.find_one({"_id": "runtime_config"})
-    if flags:
+    # Let the server drop the bookkeeping fields
+    flags = db.runtime_flags.find_one(
+        {"_id": "runtime_config"},
+        {"_id": 0, "created_at": 0, "updated_at": 0}
+    )
+    if flags is not None:
         for key, value in flags.items():
-            if key not in ["_id", "created_at", "updated_at"]:
-                print(f"   {key}: {value}")
+            print(f"   {key}: {value}")
     else:
         print("❌ No runtime flags found")
 
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    if os.environ.get("CHAOS_FLAG_DAEMON") == "1":
+        # Keep one connection open for interactive flag tuning
+        run_daemon()
+    elif len(sys.argv) == 1:
         list_flags()
     else:
         update_runtime_flags()